@@ -0,0 +1,324 @@
+"""
+Async input module - Keyboard input driven by the asyncio event loop
+"""
+
+import asyncio
+import os
+import sys
+from collections import deque
+from typing import IO, Callable, Deque, List, Optional, Tuple
+
+try:
+    import termios
+    import tty
+except ImportError:  # Windows
+    termios = None
+    tty = None
+
+
+class KeyReader:
+    """Collect key presses from stdin while a view is on screen
+
+    On POSIX, stdin is switched to cbreak mode (keys arrive unbuffered and
+    unechoed) and registered with loop.add_reader, so a key press runs
+    on_key immediately and nothing wakes up in between. Windows consoles
+    cannot be watched that way, so there msvcrt is polled every poll_interval
+    seconds instead.
+
+    pending, if given, is asked first for a key that another reader has
+    already taken from stdin (see LineReader.take_key).
+
+    Use as a context manager inside a running event loop:
+
+        with KeyReader(on_key=changed.set) as keys:
+            ...
+            if keys.pressed:
+                ...
+    """
+
+    def __init__(
+        self,
+        on_key: Optional[Callable[[], None]] = None,
+        poll_interval: float = 0.05,
+        pending: Optional[Callable[[], Optional[str]]] = None,
+    ):
+        self.on_key = on_key
+        self.poll_interval = poll_interval
+        self.pending = pending
+        self.keys: List[str] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._fd: Optional[int] = None
+        self._saved_mode = None
+        self._poll_handle: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def pressed(self) -> bool:
+        """Check whether any key has been pressed"""
+        return bool(self.keys)
+
+    def __enter__(self) -> "KeyReader":
+        self._loop = asyncio.get_running_loop()
+        key = self.pending() if self.pending is not None else None
+        if key is not None:
+            # Input another reader already took from stdin comes first; the
+            # key is in hand, so stdin itself is left alone
+            self.keys.append(key)
+            if self.on_key is not None:
+                self._loop.call_soon(self.on_key)
+            return self
+        if sys.platform == "win32":
+            self._poll_handle = self._loop.call_later(self.poll_interval, self._poll)
+            return self
+
+        self._fd = sys.stdin.fileno()
+        if termios is not None and os.isatty(self._fd):
+            self._saved_mode = termios.tcgetattr(self._fd)
+            tty.setcbreak(self._fd)
+        try:
+            self._loop.add_reader(self._fd, self._on_readable)
+        except PermissionError:
+            # Regular files and /dev/null cannot be watched, but reading
+            # them never blocks: take the next byte as the key press
+            self._loop.call_soon(self._on_readable)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._poll_handle is not None:
+            self._poll_handle.cancel()
+            self._poll_handle = None
+        if self._fd is not None:
+            self._loop.remove_reader(self._fd)
+            if self._saved_mode is not None:
+                termios.tcsetattr(self._fd, termios.TCSADRAIN, self._saved_mode)
+                self._saved_mode = None
+            self._fd = None
+
+    def _on_readable(self) -> None:
+        """Read one key press from stdin"""
+        # Read one byte at a time: anything past the key press is the next
+        # command when stdin is a pipe, and must stay there
+        data = os.read(self._fd, 1)
+        if not data:
+            # End of input: nothing more will come, so stop watching
+            self._loop.remove_reader(self._fd)
+            self.keys.append("")
+        else:
+            self.keys.append(data.decode("utf-8", "replace"))
+        if self.on_key is not None:
+            self.on_key()
+
+    def _poll(self) -> None:
+        """Check the Windows console for key presses"""
+        import msvcrt
+        pressed = False
+        while msvcrt.kbhit():
+            self.keys.append(msvcrt.getwch())
+            pressed = True
+        if pressed and self.on_key is not None:
+            self.on_key()
+        self._poll_handle = self._loop.call_later(self.poll_interval, self._poll)
+
+
+class LineReader:
+    """Read command lines from stdin (or another file) without a thread per line
+
+    On POSIX, stdin is registered with loop.add_reader and complete lines
+    are queued as they arrive, so readline() is a plain queue wait that
+    shutdown can cancel. Windows consoles cannot be registered with the
+    loop, so there one daemon thread reads lines and hands them over.
+
+    Regular files and /dev/null cannot be registered either; reading them
+    never blocks, so when stdin is redirected from one, readline() reads it
+    directly.
+
+    pause() stops reading while something else owns stdin, such as a
+    KeyReader in watch mode. Input is read in chunks, so lines may already
+    be queued by then; take_key() hands their first character over, which
+    is what the KeyReader would have read from stdin.
+    """
+
+    def __init__(self, file: Optional[IO[str]] = None):
+        self._file = file if file is not None else sys.stdin
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lines: Deque[Optional[str]] = deque()  # None marks end of input
+        self._arrived = asyncio.Event()
+        self._buffer = b""
+        self._fd: Optional[int] = None
+        self._reading = False
+        self._direct = False
+        self._thread = None
+
+    def start(self) -> None:
+        """Begin reading the file"""
+        self._loop = asyncio.get_running_loop()
+        if sys.platform == "win32":
+            import threading
+            self._thread = threading.Thread(target=self._read_lines, name="stdin-reader", daemon=True)
+            self._thread.start()
+            return
+        self._fd = self._file.fileno()
+        self.resume()
+
+    def close(self) -> None:
+        """Stop reading the file"""
+        self.pause()
+        self._fd = None
+
+    def pause(self) -> None:
+        """Leave the file alone until resume()"""
+        if self._reading:
+            self._loop.remove_reader(self._fd)
+            self._reading = False
+
+    def resume(self) -> None:
+        """Continue reading the file after pause()"""
+        if self._fd is not None and not self._reading and not self._direct:
+            try:
+                self._loop.add_reader(self._fd, self._on_readable)
+            except PermissionError:
+                self._direct = True
+                return
+            self._reading = True
+
+    async def readline(self) -> Optional[str]:
+        """Wait for the next line, without its newline; None at end of input"""
+        while self._direct and not self._lines:
+            self._on_readable()
+        while not self._lines:
+            self._arrived.clear()
+            await self._arrived.wait()
+        line = self._lines[0]
+        if line is not None:  # Every later call sees the end too
+            self._lines.popleft()
+        return line
+
+    def take_key(self) -> Optional[str]:
+        """Take one character already read but not yet returned as a line
+
+        Returns "" at end of input, and None if nothing is waiting.
+        """
+        if self._lines:
+            line = self._lines[0]
+            if line is None:
+                return ""
+            if not line:
+                self._lines.popleft()
+                return "\n"
+            # What is left of the line is read as the rest of it, as when
+            # a key reader takes the first byte from stdin
+            self._lines[0] = line[1:]
+            return line[0]
+        if self._buffer:
+            key, self._buffer = self._buffer[:1], self._buffer[1:]
+            return self._decode(key)
+        return None
+
+    def _put(self, line: Optional[str]) -> None:
+        """Queue a line for readline()"""
+        self._lines.append(line)
+        self._arrived.set()
+
+    def _on_readable(self) -> None:
+        """Queue every complete line that has arrived"""
+        data = os.read(self._fd, 4096)
+        if not data:
+            self.pause()
+            if self._buffer:
+                self._put(self._decode(self._buffer))
+                self._buffer = b""
+            self._put(None)
+            return
+        self._buffer += data
+        *lines, self._buffer = self._buffer.split(b"\n")
+        for line in lines:
+            self._put(self._decode(line))
+
+    def _decode(self, line: bytes) -> str:
+        """Turn a raw line into text"""
+        encoding = getattr(self._file, "encoding", None) or "utf-8"
+        return line.decode(encoding, "replace").rstrip("\r")
+
+    def _read_lines(self) -> None:
+        """Thread body for Windows: read lines until end of input"""
+        for line in self._file:
+            self._loop.call_soon_threadsafe(self._put, line.rstrip("\r\n"))
+        self._loop.call_soon_threadsafe(self._put, None)
+
+
+def parse_script_line(line: str) -> Tuple[Optional[float], str]:
+    """Split a script line into its recorded offset (or None) and command"""
+    head, sep, command = line.partition("\t")
+    if sep:
+        try:
+            return float(head), command
+        except ValueError:
+            pass
+    return None, line
+
+
+class ScriptReader:
+    """Replay a command script with the LineReader interface
+
+    Each line is a command, or the answer to the prompt a command asks.
+    A line may start with the seconds since recording began and a tab
+    ("12.500\tdone 3f2a9c"), as ScriptRecorder writes them; lines starting
+    with # are comments. With timed=True every line is held back until its
+    offset has passed, otherwise lines are handed out as fast as they are
+    asked for.
+    """
+
+    def __init__(self, source: LineReader, timed: bool = False):
+        self.source = source
+        self.timed = timed
+        self._start: Optional[float] = None
+
+    def start(self) -> None:
+        """Begin reading the script"""
+        self._start = asyncio.get_running_loop().time()
+        self.source.start()
+
+    def close(self) -> None:
+        """Stop reading the script"""
+        self.source.close()
+
+    def pause(self) -> None:
+        """Pause the underlying reader"""
+        self.source.pause()
+
+    def resume(self) -> None:
+        """Resume the underlying reader"""
+        self.source.resume()
+
+    async def readline(self) -> Optional[str]:
+        """Wait for the next script line; None at the end of the script"""
+        while True:
+            line = await self.source.readline()
+            if line is None or not line.startswith("#"):
+                break
+        if line is None:
+            return None
+        offset, command = parse_script_line(line)
+        if self.timed and offset is not None:
+            loop = asyncio.get_running_loop()
+            delay = self._start + offset - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        return command
+
+
+class ScriptRecorder:
+    """Write every line read in a session as a timed script for ScriptReader"""
+
+    def __init__(self, path: str):
+        self._file = open(path, "w", encoding="utf-8")
+        self._start = asyncio.get_running_loop().time()
+
+    def write(self, line: str) -> None:
+        """Append one line with its offset from the start of the session"""
+        offset = asyncio.get_running_loop().time() - self._start
+        self._file.write(f"{offset:.3f}\t{line}\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the script file"""
+        self._file.close()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Todo ID prefix lookups
+
+Times TodoManager.get with the 6-character short IDs the UI shows, with
+full IDs and with prefixes that match nothing, on N todos held in memory
+(json) or queried from SQLite. Reports seconds per lookup.
+
+    python benchmarks/bench_lookups.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import random
+import shutil
+import tempfile
+
+from common import Results, best_of, make_todos, metric, print_results, write_results
+
+from index import AmbiguousIDError
+from storage import create_storage
+from todo import TodoManager
+
+BACKENDS = ("json", "sqlite")
+
+
+def run(sizes, backends=BACKENDS, lookups: int = 2000, repeat: int = 3) -> Results:
+    """Measure lookups per todo count and backend"""
+    results: Results = {}
+    rng = random.Random(3)
+    for n in sizes:
+        todos = make_todos(n)
+        ids = [todo.id for todo in rng.choices(todos, k=lookups)]
+        cases = {
+            "short": [todo_id[:6] for todo_id in ids],
+            "full": ids,
+            "miss": ["zz" + todo_id[2:6] for todo_id in ids],
+        }
+        for backend in backends:
+            data_dir = tempfile.mkdtemp(prefix="pomodoro-bench-")
+            try:
+                storage = create_storage(backend, data_dir, durability="none")
+                storage.save_todos(todos)
+                manager = TodoManager(storage)
+                for case, keys in cases.items():
+                    def lookup_all():
+                        for key in keys:
+                            try:
+                                manager.get(key)
+                            except AmbiguousIDError:
+                                pass  # Short IDs collide at large counts
+                    seconds = best_of(lookup_all, repeat) / len(keys)
+                    metric(results, f"lookup.{backend}.{case}.{n}", seconds)
+                if hasattr(storage, "close"):
+                    storage.close()
+            finally:
+                shutil.rmtree(data_dir, ignore_errors=True)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--json", metavar="FILE", help="Also write results to FILE")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.backends)
+    print_results(results)
+    if args.json:
+        write_results(args.json, results)
+
+
+if __name__ == "__main__":
+    main()
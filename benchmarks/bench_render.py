@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Dashboard rendering
+
+Times PomodoroUI.create_main_display plus printing the result to an
+off-screen 120x40 console, with T running timers and N pending todos.
+"cold" uses a fresh PomodoroUI each frame (no cached rows), "warm"
+redraws with unchanged todos, as the live dashboard does between changes.
+
+    python benchmarks/bench_render.py --timers 1 10 100 --todos 1000 100000
+"""
+
+import argparse
+import io
+
+from common import Results, best_of, make_todos, metric, print_results, write_results
+
+from rich.console import Console
+
+from storage import Timer
+from ui import PomodoroUI
+
+
+def make_ui() -> PomodoroUI:
+    """Create a UI drawing to an in-memory terminal"""
+    ui = PomodoroUI()
+    ui.console = Console(file=io.StringIO(), width=120, height=40, force_terminal=True)
+    return ui
+
+
+def run(timer_counts, todo_counts, repeat: int = 5) -> Results:
+    """Measure cold and warm frames for each combination"""
+    results: Results = {}
+    for n_todos in todo_counts:
+        todos = [todo for todo in make_todos(n_todos) if not todo.completed]
+        for n_timers in timer_counts:
+            timers = []
+            for i in range(n_timers):
+                timer = Timer.create(f"Timer {i}", 25)
+                timer.start()
+                timers.append(timer)
+
+            def frame(ui: PomodoroUI) -> None:
+                display = ui.create_main_display(timers, todos, todo_version=1)
+                ui.console.print(display)
+                ui.console.file.seek(0)
+                ui.console.file.truncate()
+
+            warm_ui = make_ui()
+            frame(warm_ui)
+            key = f"{n_timers}x{n_todos}"
+            metric(results, f"render.cold.{key}", best_of(lambda: frame(make_ui()), repeat))
+            metric(results, f"render.warm.{key}", best_of(lambda: frame(warm_ui), repeat))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--timers", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--todos", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--json", metavar="FILE", help="Also write results to FILE")
+    args = parser.parse_args()
+
+    results = run(args.timers, args.todos)
+    print_results(results)
+    if args.json:
+        write_results(args.json, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Storage load and save
+
+Times Storage.save_todos and load_todos for each backend on N generated
+todos, plus a single-todo update through save_changes, which is what every
+add/done/delete costs.
+
+    python benchmarks/bench_storage.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import shutil
+import tempfile
+
+from common import Results, best_of, make_todos, metric, print_results, write_results
+
+from storage import create_storage
+
+BACKENDS = ("json", "journal", "sqlite")
+
+
+def run(sizes, backends=BACKENDS, repeat: int = 3) -> Results:
+    """Measure load, save and single updates for every backend and size"""
+    results: Results = {}
+    for n in sizes:
+        todos = make_todos(n)
+        for backend in backends:
+            data_dir = tempfile.mkdtemp(prefix="pomodoro-bench-")
+            try:
+                storage = create_storage(backend, data_dir, durability="none")
+                prefix = f"storage.{backend}"
+                metric(results, f"{prefix}.save.{n}", best_of(lambda: storage.save_todos(todos), repeat))
+                metric(results, f"{prefix}.load.{n}", best_of(storage.load_todos, repeat))
+
+                todo = todos[n // 2]
+                metric(results, f"{prefix}.update.{n}",
+                       best_of(lambda: storage.save_changes("update", [todo], todos), repeat))
+                if hasattr(storage, "close"):
+                    storage.close()
+            finally:
+                shutil.rmtree(data_dir, ignore_errors=True)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--json", metavar="FILE", help="Also write results to FILE")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.backends)
+    print_results(results)
+    if args.json:
+        write_results(args.json, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Deadline heap vs hierarchical timing wheel
+
+Schedules N timers with deadlines spread over an hour, pauses and resumes
+a tenth of them, cancels half, then drains the rest on a simulated clock
+advancing one second at a time. Reports seconds per phase.
+
+    python benchmarks/bench_timer_engines.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import random
+import time
+
+from common import Results, metric, print_results, write_results
+
+from timer import _DeadlineHeap, _TimingWheel
+
+START = 1000.0
+HORIZON = 3600.0
+STRUCTURES = {
+    "heap": lambda: _DeadlineHeap(),
+    "wheel": lambda: _TimingWheel(start=START),
+}
+
+
+def run_schedule(schedule, n: int, seed: int = 42) -> dict:
+    """Time each phase of the workload on one schedule structure"""
+    rng = random.Random(seed)
+    ids = [f"{i:08x}" for i in range(n)]
+    deadlines = [START + rng.uniform(1, HORIZON) for _ in range(n)]
+    results = {}
+
+    t0 = time.perf_counter()
+    for timer_id, deadline in zip(ids, deadlines):
+        schedule.push(timer_id, deadline)
+    results["add"] = time.perf_counter() - t0
+
+    paused = rng.sample(ids, n // 10)
+    t0 = time.perf_counter()
+    for timer_id in paused:
+        schedule.discard(timer_id)
+    for timer_id in paused:
+        schedule.push(timer_id, START + rng.uniform(1, HORIZON))
+    results["pause_resume"] = time.perf_counter() - t0
+
+    cancelled = rng.sample(ids, n // 2)
+    t0 = time.perf_counter()
+    for timer_id in cancelled:
+        schedule.discard(timer_id)
+    results["cancel"] = time.perf_counter() - t0
+
+    fired = 0
+    t0 = time.perf_counter()
+    now = START
+    while now <= START + HORIZON + 1:
+        schedule.peek()
+        fired += len(schedule.pop_due(now))
+        now += 1.0
+    results["drain"] = time.perf_counter() - t0
+
+    assert fired == n - n // 2, (fired, n)
+    return results
+
+
+def run(sizes, structures=tuple(STRUCTURES)) -> Results:
+    """Measure every schedule structure at every timer count"""
+    results: Results = {}
+    for n in sizes:
+        for name in structures:
+            for phase, value in run_schedule(STRUCTURES[name](), n).items():
+                metric(results, f"timer_engines.{name}.{phase}.{n}", value)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--structures", nargs="+", choices=STRUCTURES, default=list(STRUCTURES))
+    parser.add_argument("--json", metavar="FILE", help="Also write results to FILE")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.structures)
+    print_results(results)
+    if args.json:
+        write_results(args.json, results)
+
+
+if __name__ == "__main__":
+    main()
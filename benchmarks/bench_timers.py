@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark - TimerManager throughput and accuracy
+
+Runs N short timers (1-2 seconds, spread across both) to completion on a
+real event loop with each engine. Reports the time to start them all, the
+CPU time the whole run used, and how late on_complete fired relative to
+each timer's deadline (mean, 99th percentile, max). Also times cancelling
+half of N idle timers one by one and sweeping the rest with
+cleanup_completed.
+
+    python benchmarks/bench_timers.py --sizes 10 1000 10000
+"""
+
+import argparse
+import asyncio
+import time
+
+from common import Results, metric, print_results, write_results
+
+from timer import ENGINES, TimerManager
+
+
+async def run_engine(engine: str, n: int) -> dict:
+    """Run n timers to completion and collect timings"""
+    manager = TimerManager(engine=engine)
+    lateness = []
+
+    def on_complete(timer):
+        lateness.append(time.monotonic() - timer.deadline)
+
+    manager.set_callbacks(on_tick=lambda timers: None, on_complete=on_complete)
+    for i in range(n):
+        timer = manager.add_timer(f"Timer {i}", 0)
+        timer.total_seconds = 1 + i % 2
+
+    cpu0 = time.process_time()
+    t0 = time.perf_counter()
+    await manager.start_all()
+    started = time.perf_counter() - t0
+    await manager.wait_all()
+    cpu = time.process_time() - cpu0
+    manager.stop_all()
+
+    assert len(lateness) == n, (len(lateness), n)
+    lateness.sort()
+    return {
+        "start": started,
+        "cpu": cpu,
+        "late_mean": sum(lateness) / n,
+        "late_p99": lateness[min(n - 1, int(n * 0.99))],
+        "late_max": lateness[-1],
+    }
+
+
+def run_removals(n: int) -> dict:
+    """Cancel half of n timers by ID, then clean up the other half"""
+    manager = TimerManager()
+    timers = [manager.add_timer(f"Timer {i}", 1) for i in range(n)]
+
+    t0 = time.perf_counter()
+    for timer in timers[::2]:
+        manager.remove_timer(timer.id)
+    cancel = time.perf_counter() - t0
+
+    for timer in timers[1::2]:
+        timer.total_seconds = 0
+    t0 = time.perf_counter()
+    removed = manager.cleanup_completed()
+    cleanup = time.perf_counter() - t0
+
+    assert removed == n // 2 and not manager.timers, removed
+    return {"cancel": cancel, "cleanup": cleanup}
+
+
+def run(sizes, engines=ENGINES) -> Results:
+    """Measure every engine at every timer count"""
+    results: Results = {}
+    for n in sizes:
+        for name, value in run_removals(n).items():
+            metric(results, f"timers.{name}.{n}", value)
+        for engine in engines:
+            timings = asyncio.run(run_engine(engine, n))
+            for name, value in timings.items():
+                metric(results, f"timers.{engine}.{name}.{n}", value)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 10_000])
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--json", metavar="FILE", help="Also write results to FILE")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.engines)
+    print_results(results)
+    if args.json:
+        write_results(args.json, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Memory and load time of todo representations
+
+Compares a plain (__dict__) dataclass equivalent to the old Todo, the
+slotted Todo and TodoColumns on N generated todos, reporting resident
+bytes per todo (tracemalloc) and time to load them from todos.json.
+
+    python benchmarks/bench_todo_memory.py --sizes 10000 100000
+"""
+
+import argparse
+import json
+import shutil
+import tempfile
+import tracemalloc
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+from common import Results, best_of, make_todos, metric, print_results, write_results
+
+from storage import Storage, Todo, _iter_json_array
+
+
+@dataclass
+class DictTodo:
+    """Unslotted copy of the Todo fields, as before slots"""
+    id: str
+    title: str
+    completed: bool = False
+    created_at: str = ""
+    completed_at: Optional[str] = None
+    timer_minutes: Optional[int] = None
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(timestamp: Optional[str]) -> int:
+    """Convert an ISO timestamp to integer microseconds, -1 for None"""
+    if timestamp is None:
+        return -1
+    return (datetime.fromisoformat(timestamp) - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(micros: int) -> Optional[str]:
+    """Convert integer microseconds back to the original ISO timestamp"""
+    if micros < 0:
+        return None
+    return (_EPOCH + micros * _MICROSECOND).isoformat()
+
+
+class TodoColumns:
+    """Column-oriented todos, the compact alternative being measured
+
+    Flags, timer durations and timestamps live in typed arrays (timestamps
+    as integer microseconds, exact to the ISO strings), so a todo costs a
+    few bytes plus its ID and title strings instead of a full object.
+    Todo objects are built on demand by indexing.
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.titles = []
+        self.completed = array("b")
+        self.timer_minutes = array("l")  # -1 for no timer
+        self.created_at = array("q")
+        self.completed_at = array("q")  # -1 while pending
+
+    @classmethod
+    def from_dicts(cls, items: Iterable[Dict[str, Any]]) -> "TodoColumns":
+        """Build columns straight from serialized todos"""
+        columns = cls()
+        for item in items:
+            columns.ids.append(item["id"])
+            columns.titles.append(item["title"])
+            columns.completed.append(bool(item.get("completed", False)))
+            timer_minutes = item.get("timer_minutes")
+            columns.timer_minutes.append(-1 if timer_minutes is None else timer_minutes)
+            columns.created_at.append(_to_micros(item["created_at"]))
+            columns.completed_at.append(_to_micros(item.get("completed_at")))
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i: int) -> Todo:
+        timer_minutes = self.timer_minutes[i]
+        return Todo(
+            id=self.ids[i],
+            title=self.titles[i],
+            completed=bool(self.completed[i]),
+            created_at=_from_micros(self.created_at[i]),
+            completed_at=_from_micros(self.completed_at[i]),
+            timer_minutes=None if timer_minutes < 0 else timer_minutes,
+        )
+
+
+def load_columns(storage: Storage) -> TodoColumns:
+    """Stream todos.json into columns without building Todo objects"""
+    with open(storage.todos_file, "r", encoding="utf-8") as f:
+        return TodoColumns.from_dicts(_iter_json_array(f))
+
+
+def measure(build) -> int:
+    """Return bytes retained by building a representation"""
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def run(sizes, repeat: int = 3) -> Results:
+    """Measure memory per todo and load time for every todo count"""
+    results: Results = {}
+    for n in sizes:
+        items = [todo.to_dict() for todo in make_todos(n)]
+        # Memory excludes the parsed JSON the representations are built from
+        builders = {
+            "dataclass": lambda: [DictTodo(**item) for item in items],
+            "slotted": lambda: [Todo.from_dict(item) for item in items],
+            "columns": lambda: TodoColumns.from_dicts(items),
+        }
+        for name, build in builders.items():
+            metric(results, f"todo_memory.{name}.bytes.{n}", measure(build) / n, "B/todo")
+
+        data_dir = tempfile.mkdtemp(prefix="pomodoro-bench-")
+        try:
+            storage = Storage(data_dir)
+            with open(storage.todos_file, "w", encoding="utf-8") as f:
+                json.dump(items, f)
+            metric(results, f"todo_memory.slotted.load.{n}", best_of(storage.load_todos, repeat))
+            metric(results, f"todo_memory.columns.load.{n}", best_of(lambda: load_columns(storage), repeat))
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--json", metavar="FILE", help="Also write results to FILE")
+    args = parser.parse_args()
+
+    results = run(args.sizes)
+    print_results(results)
+    if args.json:
+        write_results(args.json, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark helpers - Timing, generated data and machine-readable results
+
+Results are flat dictionaries mapping a dotted metric name (for example
+"storage.json.load.10000") to {"value": float, "unit": str}, so runs from
+different commits can be compared key by key.
+"""
+
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from storage import Todo
+
+Results = Dict[str, Dict[str, Any]]
+
+
+def best_of(fn: Callable[[], Any], repeat: int = 3, setup: Optional[Callable[[], Any]] = None) -> float:
+    """Return the fastest of several runs of fn, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def make_todos(count: int, seed: int = 7) -> List[Todo]:
+    """Generate todos with varied titles, about a third completed"""
+    rng = random.Random(seed)
+    todos = []
+    for i in range(count):
+        todo = Todo.create(f"Task {i} {'x' * rng.randint(5, 30)}", rng.choice([None, 25, 50]))
+        if rng.random() < 0.3:
+            todo.mark_complete()
+        todos.append(todo)
+    return todos
+
+
+def metric(results: Results, name: str, value: float, unit: str = "s") -> None:
+    """Record one measurement"""
+    results[name] = {"value": value, "unit": unit}
+
+
+def print_results(results: Results) -> None:
+    """Print measurements as an aligned table"""
+    width = max((len(name) for name in results), default=0)
+    for name, entry in results.items():
+        print(f"{name:<{width}}  {format_value(entry['value'], entry['unit'])}")
+
+
+def format_value(value: float, unit: str) -> str:
+    """Format a measurement with a readable scale"""
+    if unit == "s":
+        if value < 1e-3:
+            return f"{value * 1e6:10.1f} us"
+        if value < 1:
+            return f"{value * 1e3:10.2f} ms"
+        return f"{value:10.3f} s"
+    return f"{value:10.1f} {unit}"
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the commit and machine a run was made on"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def write_results(path: str, results: Results) -> None:
+    """Save results with their environment as JSON"""
+    data = {"environment": environment(), "results": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def load_results(path: str) -> Results:
+    """Read results saved by write_results"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
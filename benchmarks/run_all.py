@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Run the whole suite and compare against a previous run
+
+Runs the storage, lookup, timer, timer engine, todo memory and render
+benchmarks, prints every metric and writes them as JSON. With --compare,
+each metric is shown next to the same metric from an earlier results file
+with the relative change, and metrics more than --threshold slower (or
+larger, for memory) are flagged.
+
+    python benchmarks/run_all.py --output results.json
+    python benchmarks/run_all.py --quick --compare results.json
+"""
+
+import argparse
+import sys
+
+from common import Results, format_value, load_results, print_results, write_results
+
+import bench_lookups
+import bench_render
+import bench_storage
+import bench_timer_engines
+import bench_timers
+import bench_todo_memory
+
+FULL = {
+    "storage": [1_000, 10_000, 100_000],
+    "lookups": [1_000, 10_000, 100_000],
+    "timers": [10, 1_000, 10_000],
+    "engines": [10_000, 100_000, 1_000_000],
+    "memory": [100_000],
+    "render_timers": [1, 10, 100],
+    "render_todos": [1_000, 100_000],
+}
+QUICK = {
+    "storage": [1_000, 10_000],
+    "lookups": [1_000, 10_000],
+    "timers": [10, 1_000],
+    "engines": [10_000, 100_000],
+    "memory": [10_000],
+    "render_timers": [1, 10],
+    "render_todos": [1_000],
+}
+SUITES = ("storage", "lookups", "timers", "engines", "memory", "render")
+
+
+def run(sizes: dict, suites=SUITES) -> Results:
+    """Run the selected benchmarks and merge their results"""
+    results: Results = {}
+    if "storage" in suites:
+        results.update(bench_storage.run(sizes["storage"]))
+    if "lookups" in suites:
+        results.update(bench_lookups.run(sizes["lookups"]))
+    if "timers" in suites:
+        results.update(bench_timers.run(sizes["timers"]))
+    if "engines" in suites:
+        results.update(bench_timer_engines.run(sizes["engines"]))
+    if "memory" in suites:
+        results.update(bench_todo_memory.run(sizes["memory"]))
+    if "render" in suites:
+        results.update(bench_render.run(sizes["render_timers"], sizes["render_todos"]))
+    return results
+
+
+def compare(results: Results, baseline: Results, threshold: float) -> int:
+    """Print results beside the baseline, return how many regressed"""
+    width = max((len(name) for name in results), default=0)
+    regressions = 0
+    for name, entry in results.items():
+        line = f"{name:<{width}}  {format_value(entry['value'], entry['unit'])}"
+        old = baseline.get(name)
+        if old is not None and old["value"] > 0:
+            change = entry["value"] / old["value"] - 1
+            line += f"  was {format_value(old['value'], old['unit'])}  {change:+7.1%}"
+            if change > threshold:
+                line += "  SLOWER"
+                regressions += 1
+        print(line)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="Use smaller sizes")
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES))
+    parser.add_argument("--output", "-o", metavar="FILE", help="Write results to FILE as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="Compare with results from FILE")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Relative slowdown flagged by --compare (default 0.2)")
+    args = parser.parse_args()
+
+    results = run(QUICK if args.quick else FULL, args.suites)
+    if args.compare:
+        regressions = compare(results, load_results(args.compare), args.threshold)
+    else:
+        print_results(results)
+        regressions = 0
+    if args.output:
+        write_results(args.output, results)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
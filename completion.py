@@ -0,0 +1,113 @@
+"""
+Completion module - Off-loop handling of finished timers
+"""
+
+import queue
+import sys
+import threading
+from typing import Callable, List, Optional
+
+from storage import Timer, Todo
+
+
+class CompletionPipeline:
+    """Processes finished timers on a worker thread
+
+    submit() only enqueues, so the event loop never waits on desktop
+    notifications or todo storage writes. The worker collects timers that
+    finish close together into one batch: their linked todos are completed
+    with a single storage write, the sessions are logged to the history,
+    then notifications are sent.
+
+    A batch that fails is reported through on_error (or stderr) and the
+    worker moves on, so one failed write does not silence later timers.
+    """
+
+    def __init__(
+        self,
+        todo_manager,
+        notify: Callable[[str, str], None],
+        on_todos_completed: Optional[Callable[[List[Todo]], None]] = None,
+        history=None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        batch_window: float = 0.05,
+    ):
+        self.todo_manager = todo_manager
+        self.notify = notify
+        self.on_todos_completed = on_todos_completed
+        self.history = history
+        self.on_error = on_error
+        self.batch_window = batch_window
+        self._queue: "queue.Queue[Optional[Timer]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+    def submit(self, timer: Timer) -> None:
+        """Queue a finished timer for processing"""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="completion-worker", daemon=True)
+            self._worker.start()
+        self._queue.put(timer)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Process everything queued so far and stop the worker"""
+        if self._worker is None:
+            return
+        self._queue.put(None)
+        self._worker.join(timeout)
+        self._worker = None
+
+    def _run(self) -> None:
+        """Worker loop: gather a batch, process it, repeat until closed"""
+        stopping = False
+        while not stopping:
+            timer = self._queue.get()
+            if timer is None:
+                break
+
+            batch = [timer]
+            while True:
+                try:
+                    timer = self._queue.get(timeout=self.batch_window)
+                except queue.Empty:
+                    break
+                if timer is None:
+                    stopping = True
+                    break
+                batch.append(timer)
+
+            try:
+                self._process(batch)
+            except Exception as e:
+                self._report(e)
+
+    def _report(self, error: Exception) -> None:
+        """Tell the user a batch failed without stopping the worker"""
+        if self.on_error is not None:
+            try:
+                self.on_error(error)
+                return
+            except Exception:
+                pass
+        print(f"Error: could not process finished timers: {error}", file=sys.stderr)
+
+    def _process(self, batch: List[Timer]) -> None:
+        """Complete linked todos in one write, log the sessions, then notify"""
+        todo_ids = [timer.todo_id for timer in batch if timer.todo_id]
+        if todo_ids:
+            completed = self.todo_manager.complete_many(todo_ids)
+            if completed and self.on_todos_completed:
+                self.on_todos_completed(completed)
+
+        if self.history is not None:
+            self.history.record(batch, completed=True)
+
+        if len(batch) == 1:
+            self.notify(
+                "Pomodoro Complete!",
+                f"'{batch[0].title}' finished! Time for a break."
+            )
+        else:
+            self.notify(
+                "Pomodoros Complete!",
+                f"{len(batch)} timers finished! Time for a break."
+            )
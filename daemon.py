@@ -0,0 +1,198 @@
+"""
+Daemon module - Background process owning timers, served over a Unix socket
+"""
+
+import json
+import socket
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TYPE_CHECKING
+
+from index import AmbiguousIDError
+
+if TYPE_CHECKING:
+    import asyncio
+    from storage import Timer
+
+# asyncio and storage are imported where they are used, so clients that
+# only call send_request (pomoctl) start in milliseconds
+
+def timer_to_dict(timer: "Timer") -> Dict[str, Any]:
+    """Serialize a timer's current state for clients"""
+    return {
+        "id": timer.id,
+        "title": timer.title,
+        "total_seconds": timer.total_seconds,
+        "remaining_time": timer.remaining_time,
+        "todo_id": timer.todo_id,
+        "paused": timer.paused,
+    }
+
+
+def timer_from_dict(data: Dict[str, Any]) -> "Timer":
+    """Rebuild a timer snapshot received from the daemon"""
+    from storage import Timer
+    timer = Timer(
+        id=data["id"],
+        title=data["title"],
+        total_seconds=data["total_seconds"],
+        todo_id=data["todo_id"],
+        paused=data["paused"],
+    )
+    now = time.monotonic()
+    timer.deadline = now + data["remaining_time"]
+    if timer.paused:
+        timer.paused_at = now
+    return timer
+
+
+class PomodoroDaemon:
+    """Serves timer and todo commands to CLI clients over a Unix socket
+
+    Requests and responses are single JSON lines: {"cmd": ..., "args": {...}}
+    answered by {"ok": true, ...} or {"ok": false, "error": ...}.
+    """
+
+    def __init__(self, socket_path: Path, todo_manager, timer_manager):
+        self.socket_path = Path(socket_path)
+        self.todo_manager = todo_manager
+        self.timer_manager = timer_manager
+        self._stopped: Optional["asyncio.Event"] = None
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "add": self._add,
+            "pause": self._pause,
+            "resume": self._resume,
+            "done": self._done,
+            "status": self._status,
+            "stop": self._stop,
+        }
+
+    async def serve(self) -> None:
+        """Listen on the socket until a stop request arrives"""
+        import asyncio
+        if is_running(self.socket_path):
+            raise RuntimeError(f"Daemon already running on {self.socket_path}")
+        if self.socket_path.exists():
+            # Left behind by a daemon that did not shut down cleanly
+            self.socket_path.unlink()
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self._stopped = asyncio.Event()
+        server = await asyncio.start_unix_server(self._handle_client, path=str(self.socket_path))
+        try:
+            await self.timer_manager.start_all()
+            await self._stopped.wait()
+        finally:
+            server.close()
+            await server.wait_closed()
+            self.timer_manager.stop_all()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+
+    async def _handle_client(self, reader: "asyncio.StreamReader", writer: "asyncio.StreamWriter") -> None:
+        """Answer each request line from one client connection"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = self.handle(line)
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+                if self._stopped.is_set():
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def handle(self, line: bytes) -> Dict[str, Any]:
+        """Dispatch one raw request line and build the response"""
+        try:
+            request = json.loads(line)
+            handler = self._handlers[request["cmd"]]
+        except (ValueError, KeyError, TypeError):
+            return {"ok": False, "error": "Malformed request"}
+
+        try:
+            return handler(request.get("args") or {})
+        except AmbiguousIDError as e:
+            return {"ok": False, "error": str(e)}
+        except (KeyError, TypeError, ValueError) as e:
+            return {"ok": False, "error": f"Bad arguments: {e}"}
+
+    def _add(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Add and start a timer"""
+        minutes = int(args["minutes"])
+        title = args.get("title") or "Focus Session"
+        timer = self.timer_manager.add_timer(title, minutes)
+        self.timer_manager.start_timer(timer.id)
+        return {"ok": True, "timer": timer_to_dict(timer)}
+
+    def _pause(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Pause a timer"""
+        if self.timer_manager.pause_timer(args["id"]):
+            return {"ok": True}
+        return {"ok": False, "error": f"Timer with ID '{args['id']}' not found"}
+
+    def _resume(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Resume a paused timer"""
+        if self.timer_manager.resume_timer(args["id"]):
+            return {"ok": True}
+        return {"ok": False, "error": f"Timer with ID '{args['id']}' not found"}
+
+    def _done(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Mark a todo as complete"""
+        todo = self.todo_manager.complete(args["id"])
+        if todo:
+            return {"ok": True, "todo": todo.to_dict()}
+        return {"ok": False, "error": f"Todo with ID '{args['id']}' not found"}
+
+    def _status(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Report active timers and pending todos"""
+        return {
+            "ok": True,
+            "timers": [timer_to_dict(t) for t in self.timer_manager.get_active_timers()],
+            "todos": [t.to_dict() for t in self.todo_manager.list_pending()],
+        }
+
+    def _stop(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Shut the daemon down after answering"""
+        self._stopped.set()
+        return {"ok": True}
+
+
+def is_running(socket_path: Path) -> bool:
+    """Check if a daemon is accepting connections on the socket"""
+    if not Path(socket_path).exists():
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+
+
+def send_request(socket_path: Path, cmd: str, timeout: float = 5.0, **args: Any) -> Dict[str, Any]:
+    """Send one request to the daemon and return its response
+
+    Raises ConnectionError if no daemon is listening.
+    """
+    request = json.dumps({"cmd": cmd, "args": args}, ensure_ascii=False).encode("utf-8") + b"\n"
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(socket_path))
+            sock.sendall(request)
+            data = b""
+            while not data.endswith(b"\n"):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        raise ConnectionError(f"No daemon listening on {socket_path}") from e
+    if not data:
+        raise ConnectionError("Daemon closed the connection")
+    return json.loads(data)
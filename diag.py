@@ -0,0 +1,143 @@
+"""
+Diag module - Low-overhead latency histograms
+"""
+
+import json
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from storage import _atomic_write
+
+
+# Bucket upper bounds in seconds, roughly three per decade from 10us to 10s
+BOUNDS = [
+    scale * unit
+    for unit in (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+    for scale in (1, 2.5, 5)
+] + [10.0]
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations in seconds
+
+    Recording is a bisect and two additions, cheap enough for every timer
+    wakeup. Percentiles are estimated as the upper bound of their bucket.
+    """
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (len(BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one observation"""
+        self.counts[bisect_left(BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        """Get the mean observation"""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Estimate the value below which fraction of observations fall"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for i, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                return min(BOUNDS[i], self.max) if i < len(BOUNDS) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-ready summary that keeps the raw buckets"""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+            "total": self.total,
+            "buckets": self.counts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Histogram":
+        """Rebuild a histogram from to_dict() output"""
+        histogram = cls()
+        if len(data["buckets"]) == len(histogram.counts):
+            histogram.counts = list(data["buckets"])
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.max = data["max"]
+        return histogram
+
+
+class Diagnostics:
+    """Named histograms for one session
+
+    Metrics in use:
+      timer.wake_lateness   how late a timer coroutine or the scheduler woke
+      callback.on_tick      time spent in the batched on_tick callback
+      callback.on_complete  time spent in on_complete
+      render.frame          building and drawing one dashboard frame
+      command.<name>        handling one interactive or batch command
+    """
+
+    def __init__(self):
+        self.histograms: Dict[str, Histogram] = {}
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add one observation to the named histogram"""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.record(seconds)
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """Record how long the block takes"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - t0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert every histogram to a JSON-ready dict"""
+        return {
+            "started_at": self.started_at,
+            "ended_at": datetime.now().isoformat(timespec="seconds"),
+            "metrics": {name: h.to_dict() for name, h in sorted(self.histograms.items())},
+        }
+
+    def dump(self, path: Path) -> None:
+        """Write the histograms to a JSON file"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write(path, json.dumps(self.to_dict(), indent=2), "none")
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["Diagnostics"]:
+        """Read histograms written by dump(), or None if there are none"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        diagnostics = cls()
+        diagnostics.started_at = data.get("started_at", diagnostics.started_at)
+        for name, entry in data.get("metrics", {}).items():
+            diagnostics.histograms[name] = Histogram.from_dict(entry)
+        return diagnostics
@@ -0,0 +1,163 @@
+"""
+History module - Session log and per-day focus statistics
+"""
+
+import json
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from storage import Timer, _atomic_write, _dump_jsonl
+
+
+@dataclass
+class DayTotals:
+    """Focus totals for one day"""
+    sessions: int = 0
+    completed: int = 0
+    focus_seconds: int = 0
+
+    @property
+    def focus_minutes(self) -> int:
+        """Get focus time in whole minutes"""
+        return self.focus_seconds // 60
+
+    @property
+    def completion_rate(self) -> float:
+        """Get the share of sessions that ran to the end (0.0 to 1.0)"""
+        return self.completed / self.sessions if self.sessions else 0.0
+
+    def add(self, other: "DayTotals") -> None:
+        """Accumulate another day's totals"""
+        self.sessions += other.sessions
+        self.completed += other.completed
+        self.focus_seconds += other.focus_seconds
+
+
+class SessionHistory:
+    """Append-only log of finished and cancelled timers
+
+    Each session is one line in history.jsonl. Reports read per-day
+    rollups from history_rollup.json, which remembers how far into the log
+    it has counted, so only sessions logged since the last report are
+    parsed no matter how long the history grows.
+    """
+
+    def __init__(self, data_dir: str = "data"):
+        self.data_dir = Path(data_dir)
+        self.log_file = self.data_dir / "history.jsonl"
+        self.rollup_file = self.data_dir / "history_rollup.json"
+        self._lock = threading.Lock()
+
+    def record(self, timers: Iterable[Timer], completed: bool) -> None:
+        """Log timers that finished (completed=True) or were cancelled"""
+        ended_at = datetime.now().isoformat(timespec="seconds")
+        records = [
+            {
+                "title": timer.title,
+                "todo_id": timer.todo_id,
+                "started_at": timer.started_at,
+                "ended_at": ended_at,
+                "planned_seconds": timer.total_seconds,
+                "focus_seconds": timer.total_seconds if completed else timer.elapsed_seconds,
+                "completed": completed,
+            }
+            for timer in timers
+        ]
+        if not records:
+            return
+        with self._lock:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.log_file, "a", encoding="utf-8") as f:
+                f.write(_dump_jsonl(records))
+
+    def daily_totals(self) -> Dict[date, DayTotals]:
+        """Get totals per day, counting only sessions logged since last time"""
+        with self._lock:
+            offset, days = self._load_rollup()
+            try:
+                size = self.log_file.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if size < offset:
+                # The log was replaced or truncated; count it again
+                offset, days = 0, {}
+            if size > offset:
+                offset = self._count_sessions(offset, days)
+                self._save_rollup(offset, days)
+        return {date.fromisoformat(day): DayTotals(*totals) for day, totals in days.items()}
+
+    def _load_rollup(self) -> Tuple[int, Dict[str, List[int]]]:
+        """Read the saved rollups and the log offset they cover"""
+        try:
+            with open(self.rollup_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data["offset"], data["days"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return 0, {}
+
+    def _save_rollup(self, offset: int, days: Dict[str, List[int]]) -> None:
+        """Write the rollups and the log offset they cover"""
+        data = json.dumps({"offset": offset, "days": days}, separators=(",", ":"))
+        _atomic_write(self.rollup_file, data, "none")
+
+    def _count_sessions(self, offset: int, days: Dict[str, List[int]]) -> int:
+        """Add sessions logged after offset to the rollups, return the new offset"""
+        with open(self.log_file, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        # A line still being written is left for the next report
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                session: Dict[str, Any] = json.loads(line)
+                day = session["ended_at"][:10]
+            except (ValueError, KeyError):
+                continue
+            totals = days.setdefault(day, [0, 0, 0])
+            totals[0] += 1
+            totals[1] += int(bool(session.get("completed")))
+            totals[2] += int(session.get("focus_seconds", 0))
+        return offset + end
+
+    def summary(self, days: int = 7, today: Optional[date] = None) -> Dict[str, Any]:
+        """Build the stats report
+
+        Returns the totals of each of the last `days` days (oldest first),
+        their sum, all-time totals and the current and longest streaks of
+        days with at least one completed pomodoro.
+        """
+        today = today or date.today()
+        totals = self.daily_totals()
+
+        recent = []
+        period = DayTotals()
+        for i in range(days - 1, -1, -1):
+            day = today - timedelta(days=i)
+            day_totals = totals.get(day, DayTotals())
+            recent.append((day, day_totals))
+            period.add(day_totals)
+
+        all_time = DayTotals()
+        for day_totals in totals.values():
+            all_time.add(day_totals)
+
+        active = sorted(day for day, day_totals in totals.items() if day_totals.completed)
+        longest = run = 0
+        previous = None
+        for day in active:
+            run = run + 1 if previous == day - timedelta(days=1) else 1
+            longest = max(longest, run)
+            previous = day
+        # A streak is still current until a whole day passes without a pomodoro
+        current = run if previous is not None and previous >= today - timedelta(days=1) else 0
+
+        return {
+            "days": recent,
+            "period": period,
+            "all_time": all_time,
+            "current_streak": current,
+            "longest_streak": longest,
+        }
@@ -0,0 +1,118 @@
+"""
+Index module - Prefix lookup of short IDs for timers and todos
+"""
+
+from bisect import bisect_left
+from typing import Iterable, List, Optional, Set
+
+
+class AmbiguousIDError(LookupError):
+    """Raised when an ID prefix matches more than one item"""
+
+    def __init__(self, prefix: str, matches: List[str]):
+        self.prefix = prefix
+        self.matches = matches
+        super().__init__(prefix, matches)
+
+    def __str__(self) -> str:
+        shown = ", ".join(self.matches)
+        return f"ID '{self.prefix}' is ambiguous (matches {shown})"
+
+
+class PrefixIndex:
+    """Sorted array of IDs resolving exact and prefix lookups by bisection
+
+    New IDs are buffered and merged into the sorted array on the next
+    lookup, so bulk adds cost O(1) each instead of an insort apiece.
+    Removed IDs stay in the array as tombstones that lookups skip, and are
+    compacted away once they outnumber the live IDs, so removals are
+    amortized O(1) too.
+    """
+
+    def __init__(self, ids: Iterable[str] = ()):
+        self._members = set(ids)
+        self._ids: List[str] = sorted(self._members)
+        self._pending: List[str] = []
+        self._dead: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._members
+
+    def _merge_pending(self) -> None:
+        """Fold buffered IDs into the sorted array, compacting tombstones"""
+        if len(self._dead) > len(self._members) + 64:
+            self._ids = [i for i in self._ids if i not in self._dead]
+            self._pending = [i for i in self._pending if i not in self._dead]
+            self._dead.clear()
+        if self._pending:
+            # Timsort merges the two sorted runs in linear time
+            self._pending.sort()
+            self._ids += self._pending
+            self._ids.sort()
+            self._pending = []
+
+    def add(self, item_id: str) -> None:
+        """Add an ID to the index"""
+        if item_id not in self._members:
+            self._members.add(item_id)
+            if item_id in self._dead:
+                # Still stored as a tombstone: just revive it
+                self._dead.discard(item_id)
+            else:
+                self._pending.append(item_id)
+
+    def discard(self, item_id: str) -> None:
+        """Remove an ID from the index if present"""
+        if item_id not in self._members:
+            return
+        self._members.discard(item_id)
+        self._dead.add(item_id)
+
+    def clear(self) -> None:
+        """Remove all IDs"""
+        self._members.clear()
+        self._ids.clear()
+        self._pending.clear()
+        self._dead.clear()
+
+    def matches(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Get IDs starting with prefix, in sorted order"""
+        self._merge_pending()
+        found = []
+        i = bisect_left(self._ids, prefix)
+        while i < len(self._ids) and self._ids[i].startswith(prefix):
+            if self._ids[i] in self._dead:
+                i += 1
+                continue
+            found.append(self._ids[i])
+            if limit is not None and len(found) >= limit:
+                break
+            i += 1
+        return found
+
+    def resolve(self, prefix: str) -> Optional[str]:
+        """Resolve an exact ID or unique prefix to a full ID
+
+        Raises AmbiguousIDError if the prefix matches several IDs.
+        """
+        if not prefix:
+            return None
+        if prefix in self._members:
+            return prefix
+
+        return pick_match(prefix, self.matches(prefix, limit=6))
+
+
+def pick_match(prefix: str, candidates: List[str]) -> Optional[str]:
+    """Pick the only ID matching prefix from up to six sorted candidates
+
+    Raises AmbiguousIDError if there is more than one candidate.
+    """
+    if len(candidates) > 1:
+        if len(candidates) > 5:
+            candidates = candidates[:5] + ["..."]
+        raise AmbiguousIDError(prefix, candidates)
+    return candidates[0] if candidates else None
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Pomoctl - Minimal client for a running pomodoro daemon
+
+Does the same as `pomodoro ctl` but imports neither typer nor rich nor
+the app, so each call is one socket round trip plus interpreter start.
+Output is plain text.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from daemon import send_request
+
+SOCKET_PATH = Path(__file__).parent / "data" / "pomodoro.sock"
+
+
+def format_seconds(seconds: float) -> str:
+    """Format seconds as MM:SS"""
+    minutes, secs = divmod(max(int(seconds + 0.999), 0), 60)
+    return f"{minutes:02d}:{secs:02d}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Add and start a timer in the daemon")
+    add.add_argument("minutes", type=int, nargs="?", default=25)
+    add.add_argument("title", nargs="?", default="Focus Session")
+    for name, help_text in (("pause", "Pause a daemon timer"), ("resume", "Resume a paused daemon timer"),
+                            ("done", "Mark a todo as complete through the daemon")):
+        commands.add_parser(name, help=help_text).add_argument("id")
+    commands.add_parser("status", help="Show the daemon's active timers and pending todos")
+    commands.add_parser("stop", help="Stop the daemon")
+    args = parser.parse_args()
+
+    request = {key: value for key, value in vars(args).items() if key != "command"}
+    try:
+        response = send_request(SOCKET_PATH, args.command, **request)
+    except (ConnectionError, OSError) as e:
+        print(f"Error: {e}. Start one with 'pomodoro daemon'.", file=sys.stderr)
+        sys.exit(1)
+    if not response.get("ok"):
+        print(f"Error: {response.get('error', 'Request failed')}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == "add":
+        timer = response["timer"]
+        print(f"Timer '{timer['title']}' ({args.minutes}m) started [ID: {timer['id'][:6]}]")
+    elif args.command == "status":
+        for timer in response["timers"]:
+            state = " (paused)" if timer["paused"] else ""
+            print(f"{timer['id'][:6]}  {format_seconds(timer['remaining_time'])}  {timer['title']}{state}")
+        if not response["timers"]:
+            print("No active timers")
+        for todo in response["todos"]:
+            print(f"{todo['id'][:6]}  [ ]    {todo['title']}")
+    elif args.command == "done":
+        print(f"Todo '{response['todo']['title']}' marked as complete")
+    else:
+        print({"pause": "Timer paused", "resume": "Timer resumed", "stop": "Daemon stopped"}[args.command])
+
+
+if __name__ == "__main__":
+    main()
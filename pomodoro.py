@@ -4,10 +4,9 @@ CLI Pomodoro Timer - A beautiful command-line pomodoro timer with Rich progress
 Supports multiple parallel timers, todo management, and system notifications
 """
 
-import asyncio
 import sys
 import os
-from typing import Optional
+from typing import Optional, Callable, Any, TYPE_CHECKING
 from pathlib import Path
 
 # Fix Windows console encoding
@@ -18,48 +17,198 @@ if sys.platform == "win32":
 
 import typer
 from rich.console import Console
-from rich.prompt import Prompt, Confirm, IntPrompt
-from rich.live import Live
+from rich.prompt import Confirm
+
+if TYPE_CHECKING:
+    from rich.live import Live
+    from async_input import LineReader, ScriptRecorder
 
 # Add current directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from storage import Storage
+from storage import create_storage
+from index import AmbiguousIDError
+from diag import Diagnostics
 from todo import TodoManager
-from timer import TimerManager
 from ui import PomodoroUI, send_notification, SYMBOLS
 
 app = typer.Typer(help="CLI Pomodoro Timer - Focus like a pro!")
 todo_app = typer.Typer(help="Manage todo items")
 app.add_typer(todo_app, name="todo")
+ctl_app = typer.Typer(help="Control a running pomodoro daemon")
+app.add_typer(ctl_app, name="ctl")
 
 console = Console(force_terminal=True)
 
-# Global instances
+class _Lazy:
+    """Proxy that builds the wrapped object on first attribute access"""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._obj = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._obj is None:
+            self._obj = self._factory()
+        return getattr(self._obj, name)
+
+
+def _create_timer_manager():
+    """Create the timer manager, importing asyncio only when needed"""
+    from storage import TimerStore
+    from timer import TimerManager
+    # A batch replay must neither resume nor leave behind real timers
+    store = None if batch_mode else TimerStore(str(DATA_DIR))
+    return TimerManager(
+        engine=TIMER_ENGINE,
+        store=store,
+        wheel_threshold=WHEEL_THRESHOLD,
+        diagnostics=diagnostics,
+    )
+
+
+# Global instances, built on first use so each command only pays for what
+# it touches (--help never loads todos.json)
 DATA_DIR = Path(__file__).parent / "data"
-storage = Storage(str(DATA_DIR))
-todo_manager = TodoManager(storage)
-timer_manager = TimerManager()
-ui = PomodoroUI()
+STORAGE_BACKEND = os.environ.get("POMODORO_STORAGE", "json")
+# How much fsyncing each write does: none, file or dir
+DURABILITY = os.environ.get("POMODORO_DURABILITY", "file")
+# Seconds to buffer todo changes before writing them; 0 writes each change
+FLUSH_INTERVAL = float(os.environ.get("POMODORO_FLUSH_INTERVAL", "0"))
+# How timers sleep: "tasks" (a coroutine each) or "scheduler" (one deadline heap)
+TIMER_ENGINE = os.environ.get("POMODORO_TIMER_ENGINE", "tasks")
+# Running timers above which the scheduler switches to a timing wheel
+WHEEL_THRESHOLD = int(os.environ.get("POMODORO_WHEEL_THRESHOLD", "0")) or None
+SOCKET_PATH = DATA_DIR / "pomodoro.sock"
+DIAG_FILE = DATA_DIR / "diag.json"
+# Latency histograms for this process, saved to DIAG_FILE on exit
+diagnostics = Diagnostics()
+storage = _Lazy(lambda: create_storage(STORAGE_BACKEND, str(DATA_DIR), DURABILITY))
+todo_manager = _Lazy(lambda: TodoManager(storage, flush_interval=FLUSH_INTERVAL))
+timer_manager = _Lazy(_create_timer_manager)
+ui = _Lazy(PomodoroUI)
+
+# Page of the pending todo table shown in the interactive dashboard
+todo_page = 0
+
+# Set (once per batch of timer ticks) while the interactive mode runs, so
+# views redraw only when a timer changed
+timer_changes: Optional["asyncio.Event"] = None
+
+# Reads command lines and prompt answers while the interactive mode runs
+line_reader: Optional["LineReader"] = None
+# Set by `run --record` to save every line read as a replayable script
+recorder: Optional["ScriptRecorder"] = None
+# True while `pomodoro batch` replays a script: no live display, no key presses
+batch_mode = False
+
+
+def _create_history():
+    """Create the session history log"""
+    from history import SessionHistory
+    return SessionHistory(str(DATA_DIR))
+
+
+history = _Lazy(_create_history)
+
+
+def _report_completed_todos(todos):
+    """Announce todos completed by their timers"""
+    for todo in todos:
+        ui.print_info(f"Todo '{todo.title}' marked as complete")
+
+
+def _report_completion_error(error):
+    """Announce a batch of finished timers that could not be processed"""
+    ui.print_error(f"Could not process finished timers: {error}")
+
+
+def _create_completion_pipeline():
+    """Create the worker that handles notifications and linked todos"""
+    from completion import CompletionPipeline
+    return CompletionPipeline(
+        todo_manager,
+        notify=send_notification,
+        on_todos_completed=_report_completed_todos,
+        history=history,
+        on_error=_report_completion_error,
+    )
+
+
+completions = _Lazy(_create_completion_pipeline)
 
 
 def on_timer_complete(timer):
     """Callback when a timer completes"""
     ui.print_timer_complete(timer)
-    send_notification(
-        "Pomodoro Complete!",
-        f"'{timer.title}' finished! Time for a break."
-    )
-    # If timer has associated todo, mark it complete
-    if timer.todo_id:
-        todo = todo_manager.get(timer.todo_id)
-        if todo and not todo.completed:
-            todo_manager.complete(timer.todo_id)
-            ui.print_info(f"Todo '{todo.title}' marked as complete")
+    # Notification and marking the associated todo complete happen off the
+    # event loop, batched with any other timers finishing at the same time
+    completions.submit(timer)
+
+
+def on_timers_tick(timers):
+    """Callback with the timers that changed since the last tick"""
+    if timer_changes is not None:
+        timer_changes.set()
+
+
+def cancel_timer(timer_id: str) -> bool:
+    """Remove a timer, logging it as a cancelled session if it had started
+
+    Raises AmbiguousIDError if the prefix matches several timers.
+    """
+    timer = timer_manager.get_timer(timer_id)
+    if timer is None or not timer_manager.remove_timer(timer.id):
+        return False
+    if timer.started:
+        history.record([timer], completed=False)
+    return True
+
+
+async def read_line(prompt: str) -> str:
+    """Show a prompt and wait for a line without blocking the event loop"""
+    console.print(prompt, end="")
+    line = await line_reader.readline()
+    if line is None:
+        raise EOFError
+    if recorder is not None:
+        recorder.write(line)
+    if batch_mode:
+        # Nobody typed it, so show it to keep the output readable
+        console.print(line, markup=False, highlight=False)
+    return line
+
+
+async def ask_confirm(question: str, default: bool = True) -> bool:
+    """Ask a yes/no question, like rich's Confirm.ask"""
+    choices = "[magenta bold]\\[y/n][/magenta bold]"
+    shown_default = f"[cyan bold]({'y' if default else 'n'})[/cyan bold]"
+    while True:
+        answer = (await read_line(f"{question} {choices} {shown_default}: ")).strip().lower()
+        if not answer:
+            return default
+        if answer in ("y", "yes"):
+            return True
+        if answer in ("n", "no"):
+            return False
+        console.print("[prompt.invalid]Please enter Y or N")
+
+
+async def ask_int(question: str, default: int) -> int:
+    """Ask for a whole number, like rich's IntPrompt.ask"""
+    while True:
+        answer = (await read_line(f"{question} [cyan bold]({default})[/cyan bold]: ")).strip()
+        if not answer:
+            return default
+        try:
+            return int(answer)
+        except ValueError:
+            console.print("[prompt.invalid]Please enter a valid integer number")
 
 
 async def handle_command(cmd: str) -> bool:
     """Handle interactive commands. Returns False to quit."""
+    global todo_page
     cmd = cmd.strip()
     if not cmd:
         return True
@@ -77,12 +226,14 @@ async def handle_command(cmd: str) -> bool:
         console.print("  [green]todo <title>[/green]         - Add a new todo (asks for timer)")
         console.print("  [green]status / s[/green]           - Refresh and show current status")
         console.print("  [green]watch[/green]                - Watch timers in real-time")
-        console.print("  [green]list[/green]                 - Show all todos")
+        console.print("  [green]list [page][/green]          - Show all todos, one page at a time")
+        console.print("  [green]page <n|next|prev>[/green]   - Page through pending todos")
         console.print("  [green]done <id>[/green]            - Mark todo as complete")
         console.print("  [green]del <id>[/green]             - Delete a todo or timer")
         console.print("  [green]pause <id>[/green]           - Pause a timer")
         console.print("  [green]resume <id>[/green]          - Resume a paused timer")
         console.print("  [green]clear[/green]                - Clear completed todos")
+        console.print("  [green]diag[/green]                 - Show timer lateness and render times")
         console.print("  [green]quit / q[/green]             - Exit the application")
         console.print()
 
@@ -92,6 +243,9 @@ async def handle_command(cmd: str) -> bool:
 
     elif command == "watch":
         # Real-time watch mode with in-place refresh
+        if batch_mode:
+            ui.print_info("watch is skipped in batch mode")
+            return True
         if not timer_manager.has_active_timers():
             ui.print_info("No active timers to watch")
             return True
@@ -99,21 +253,7 @@ async def handle_command(cmd: str) -> bool:
         from rich.live import Live
         from rich.console import Group
         from rich.text import Text
-        import sys
-
-        # Platform-specific keyboard detection
-        if sys.platform == "win32":
-            import msvcrt
-            def key_pressed():
-                return msvcrt.kbhit()
-            def get_key():
-                return msvcrt.getch()
-        else:
-            import select
-            def key_pressed():
-                return select.select([sys.stdin], [], [], 0)[0]
-            def get_key():
-                return sys.stdin.read(1)
+        from async_input import KeyReader
 
         def make_watch_display():
             hint = Text("Press any key to exit watch mode", style="dim")
@@ -123,17 +263,25 @@ async def handle_command(cmd: str) -> bool:
                 hint,
             )
 
-        with Live(make_watch_display(), refresh_per_second=4, console=console) as live:
-            while timer_manager.has_active_timers():
-                # Check for key press to exit
-                if key_pressed():
-                    get_key()  # Consume the key
-                    console.print("\n[dim]Exited watch mode[/dim]")
-                    break
-                live.update(make_watch_display())
-                await asyncio.sleep(0.25)
-            else:
-                ui.print_info("All timers completed!")
+        # Sleep until a batch of timer ticks or a key press; nothing polls.
+        # The key reader owns stdin until watch mode ends.
+        timer_changes.clear()
+        line_reader.pause()
+        try:
+            with KeyReader(on_key=timer_changes.set, pending=line_reader.take_key) as keys, \
+                    Live(make_watch_display(), auto_refresh=False, console=console) as live:
+                while timer_manager.has_active_timers():
+                    await timer_changes.wait()
+                    timer_changes.clear()
+                    if keys.pressed:
+                        console.print("\n[dim]Exited watch mode[/dim]")
+                        break
+                    with diagnostics.timed("render.frame"):
+                        live.update(make_watch_display(), refresh=True)
+                else:
+                    ui.print_info("All timers completed!")
+        finally:
+            line_reader.resume()
 
     elif command == "add":
         # Add a timer
@@ -161,10 +309,10 @@ async def handle_command(cmd: str) -> bool:
 
         # Ask if they want to create a timer
         console.print()
-        want_timer = Confirm.ask("Create a timer for this todo?", default=True)
+        want_timer = await ask_confirm("Create a timer for this todo?", default=True)
 
         if want_timer:
-            minutes = IntPrompt.ask("Timer duration (minutes)", default=25)
+            minutes = await ask_int("Timer duration (minutes)", default=25)
             todo = todo_manager.add(title, timer_minutes=minutes)
             timer = timer_manager.add_timer(title, minutes, todo_id=todo.id)
             timer_manager.start_timer(timer.id)
@@ -174,12 +322,42 @@ async def handle_command(cmd: str) -> bool:
             ui.print_success(f"Todo '{title}' created [ID: {todo.id[:6]}]")
 
     elif command == "list":
-        # Show all todos
+        # Show all todos, one screenful at a time
+        try:
+            page = int(parts[1]) - 1 if len(parts) > 1 else 0
+        except ValueError:
+            ui.print_error("Usage: list [page]")
+            return True
+
+        limit = ui.page_size()
         console.print()
         todos = todo_manager.list_all()
-        console.print(ui.create_todo_table(todos, show_completed=True))
+        console.print(ui.create_todo_table(
+            todos,
+            show_completed=True,
+            offset=max(page, 0) * limit,
+            limit=limit,
+        ))
         console.print()
 
+    elif command == "page":
+        if len(parts) < 2:
+            ui.print_error("Usage: page <n|next|prev>")
+            return True
+
+        # Stop at the last page the main display can show
+        limit = ui.todo_page_size(len(timer_manager.get_active_timers()))
+        last_page = max(len(todo_manager.list_pending()) - 1, 0) // limit
+        if parts[1] == "next":
+            todo_page = min(todo_page + 1, last_page)
+        elif parts[1] == "prev":
+            todo_page = min(max(todo_page - 1, 0), last_page)
+        else:
+            try:
+                todo_page = min(max(int(parts[1]) - 1, 0), last_page)
+            except ValueError:
+                ui.print_error("Usage: page <n|next|prev>")
+
     elif command == "done":
         # Mark todo as complete
         if len(parts) < 2:
@@ -187,7 +365,11 @@ async def handle_command(cmd: str) -> bool:
             return True
 
         todo_id = parts[1]
-        todo = todo_manager.complete(todo_id)
+        try:
+            todo = todo_manager.complete(todo_id)
+        except AmbiguousIDError as e:
+            ui.print_error(str(e))
+            return True
         if todo:
             ui.print_success(f"Todo '{todo.title}' marked as complete")
         else:
@@ -202,12 +384,15 @@ async def handle_command(cmd: str) -> bool:
         item_id = parts[1]
 
         # Try to delete as timer first
-        if timer_manager.remove_timer(item_id):
-            ui.print_success(f"Timer removed")
-        elif todo_manager.delete(item_id):
-            ui.print_success(f"Todo deleted")
-        else:
-            ui.print_error(f"Item with ID '{item_id}' not found")
+        try:
+            if cancel_timer(item_id):
+                ui.print_success(f"Timer removed")
+            elif todo_manager.delete(item_id):
+                ui.print_success(f"Todo deleted")
+            else:
+                ui.print_error(f"Item with ID '{item_id}' not found")
+        except AmbiguousIDError as e:
+            ui.print_error(str(e))
 
     elif command == "pause":
         if len(parts) < 2:
@@ -215,7 +400,12 @@ async def handle_command(cmd: str) -> bool:
             return True
 
         timer_id = parts[1]
-        if timer_manager.pause_timer(timer_id):
+        try:
+            paused = timer_manager.pause_timer(timer_id)
+        except AmbiguousIDError as e:
+            ui.print_error(str(e))
+            return True
+        if paused:
             ui.print_success("Timer paused")
         else:
             ui.print_error(f"Timer with ID '{timer_id}' not found")
@@ -226,7 +416,12 @@ async def handle_command(cmd: str) -> bool:
             return True
 
         timer_id = parts[1]
-        if timer_manager.resume_timer(timer_id):
+        try:
+            resumed = timer_manager.resume_timer(timer_id)
+        except AmbiguousIDError as e:
+            ui.print_error(str(e))
+            return True
+        if resumed:
             ui.print_success("Timer resumed")
         else:
             ui.print_error(f"Timer with ID '{timer_id}' not found")
@@ -235,31 +430,52 @@ async def handle_command(cmd: str) -> bool:
         count = todo_manager.clear_completed()
         ui.print_success(f"Cleared {count} completed todo(s)")
 
+    elif command == "diag":
+        console.print(ui.create_diag_table(diagnostics))
+
     else:
         ui.print_error(f"Unknown command: {command}. Type 'help' for available commands.")
 
     return True
 
 
+async def run_command(cmd: str) -> bool:
+    """Handle one command, recording how long it took. Returns False to quit."""
+    parts = cmd.split(maxsplit=1)
+    if not parts:
+        return True
+    with diagnostics.timed(f"command.{parts[0].lower()}"):
+        return await handle_command(cmd)
+
+
 def refresh_display():
     """Refresh the main display"""
     console.print()
-    console.print(ui.create_main_display(
-        timer_manager.get_active_timers(),
-        todo_manager.list_pending(),
-    ))
+    with diagnostics.timed("render.frame"):
+        console.print(ui.create_main_display(
+            timer_manager.get_active_timers(),
+            todo_manager.list_pending(),
+            todo_version=todo_manager.version,
+            todo_page=todo_page,
+        ))
     console.print()
 
 
+def save_diagnostics():
+    """Write this session's histograms for `pomodoro diag`"""
+    if diagnostics.histograms:
+        try:
+            diagnostics.dump(DIAG_FILE)
+        except OSError:
+            pass  # Diagnostics must never stop the app from exiting
+
+
 async def input_loop():
     """Async input loop that reads user commands"""
-    loop = asyncio.get_event_loop()
-
     while True:
         try:
-            # Read input in a thread to not block
-            cmd = await loop.run_in_executor(None, lambda: input("> "))
-            should_continue = await handle_command(cmd)
+            cmd = await read_line("> ")
+            should_continue = await run_command(cmd)
             if not should_continue:
                 break
             # Refresh display after each command
@@ -270,41 +486,74 @@ async def input_loop():
             break
 
 
-async def display_loop(live: Live):
+async def display_loop(live: "Live"):
     """Update the display periodically"""
+    import asyncio
+    last_key = None
     while True:
-        display = ui.create_main_display(
-            timer_manager.get_active_timers(),
-            todo_manager.list_pending(),
-        )
-        live.update(display)
-        await asyncio.sleep(0.5)
+        timers = timer_manager.get_active_timers()
+        # Skip the frame entirely when nothing visible changed
+        key = ui.display_key(timers, todo_manager.version, todo_page)
+        if key != last_key:
+            with diagnostics.timed("render.frame"):
+                display = ui.create_main_display(
+                    timers,
+                    todo_manager.list_pending(),
+                    todo_version=todo_manager.version,
+                    todo_page=todo_page,
+                )
+                live.update(display, refresh=True)
+            last_key = key
+        # Wake early when timers tick; todo changes are caught within 0.5s
+        try:
+            await asyncio.wait_for(timer_changes.wait(), 0.5)
+            timer_changes.clear()
+        except asyncio.TimeoutError:
+            pass
 
 
-async def interactive_mode():
+async def interactive_mode(record: Optional[str] = None):
     """Run the interactive mode with live display and input"""
+    import asyncio
+    from async_input import LineReader, ScriptRecorder
+    global timer_changes, line_reader, recorder
     ui.print_welcome()
 
     # Set up timer callbacks
-    timer_manager.set_callbacks(on_complete=on_timer_complete)
+    timer_changes = asyncio.Event()
+    timer_manager.set_callbacks(on_tick=on_timers_tick, on_complete=on_timer_complete)
 
-    # Start any existing timers
+    # Restore timers that were running when the app last exited
+    restored = timer_manager.restore()
+    if restored:
+        ui.print_info(f"Restored {len(restored)} timer(s) from the last session")
     await timer_manager.start_all()
 
     console.print()
     console.print(ui.create_main_display(
         timer_manager.get_active_timers(),
         todo_manager.list_pending(),
+        todo_version=todo_manager.version,
     ))
     console.print()
 
     # Run input loop
+    line_reader = LineReader()
+    line_reader.start()
+    if record:
+        recorder = ScriptRecorder(record)
     try:
         await input_loop()
     except KeyboardInterrupt:
         pass
     finally:
+        line_reader.close()
+        if recorder is not None:
+            recorder.close()
         timer_manager.stop_all()
+        completions.close()
+        todo_manager.close()
+        save_diagnostics()
         console.print("\n[bold yellow]Goodbye![/bold yellow]")
 
 
@@ -325,7 +574,7 @@ def start(
     console.print(f"\n{SYMBOLS['tomato']} Starting timer: [bold]{title}[/bold] ({minutes} minutes)")
     console.print("[dim]Press Ctrl+C to cancel[/dim]\n")
 
-    from rich.live import Live
+    import asyncio
     from rich.progress import Progress, BarColumn, TextColumn, TimeRemainingColumn, SpinnerColumn
 
     async def run_single_timer():
@@ -354,13 +603,112 @@ def start(
     try:
         asyncio.run(run_single_timer())
     except KeyboardInterrupt:
+        cancel_timer(timer.id)
         console.print("\n[bold yellow]Timer cancelled.[/bold yellow]")
+    finally:
+        completions.close()
+        save_diagnostics()
+
+
+async def batch_run(script, timed: bool) -> int:
+    """Replay commands from an open script file, return how many ran"""
+    from async_input import LineReader, ScriptReader
+    global line_reader, batch_mode
+
+    batch_mode = True
+    timer_manager.set_callbacks(on_complete=on_timer_complete)
+    await timer_manager.start_all()
+
+    # Prompts inside a command read their answers from the following lines
+    line_reader = ScriptReader(LineReader(script), timed=timed)
+    line_reader.start()
+    commands = 0
+    try:
+        while True:
+            try:
+                cmd = await read_line("> ")
+                should_continue = await run_command(cmd)
+            except EOFError:
+                break
+            if cmd.strip():
+                commands += 1
+            if not should_continue:
+                break
+    finally:
+        line_reader.close()
+        timer_manager.stop_all()
+        completions.close()
+        todo_manager.close()
+    return commands
 
 
 @app.command(name="run")
-def run_interactive():
+def run_interactive(
+    record: Optional[str] = typer.Option(None, "--record", metavar="FILE",
+                                         help="Save every line typed as a script for `batch`"),
+):
     """Start interactive mode with multiple timers and todos."""
-    asyncio.run(interactive_mode())
+    import asyncio
+    asyncio.run(interactive_mode(record))
+
+
+@app.command()
+def batch(
+    script: str = typer.Argument(..., metavar="FILE|-", help="Command script, or - for stdin"),
+    timed: bool = typer.Option(False, "--timed", help="Wait for each line's recorded offset"),
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Only print the throughput summary"),
+    as_json: bool = typer.Option(False, "--json", help="Print the summary as JSON"),
+    data_dir: Optional[Path] = typer.Option(None, "--data-dir", metavar="DIR",
+                                            help="Keep todos and history in DIR instead of ./data"),
+):
+    """Replay interactive commands from a file without the live display.
+
+    Timers started by the script are neither restored from nor saved to
+    the timer checkpoints, and diag.json is left alone.
+    """
+    import asyncio
+    import json
+    import time
+    global DATA_DIR
+
+    if data_dir is not None:
+        DATA_DIR = data_dir
+
+    try:
+        f = sys.stdin if script == "-" else open(script, "r", encoding="utf-8")
+    except OSError as e:
+        ui.print_error(str(e))
+        raise typer.Exit(1)
+
+    console.quiet = ui.console.quiet = quiet or as_json
+    t0 = time.perf_counter()
+    try:
+        commands = asyncio.run(batch_run(f, timed))
+    except KeyboardInterrupt:
+        raise typer.Exit(130)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+        console.quiet = ui.console.quiet = False
+    # The final flush is part of the cost, so the clock stops after it
+    seconds = time.perf_counter() - t0
+
+    command_times = {
+        name: histogram
+        for name, histogram in diagnostics.histograms.items()
+        if name.startswith("command.")
+    }
+    if as_json:
+        print(json.dumps({
+            "commands": commands,
+            "seconds": seconds,
+            "per_second": commands / seconds if seconds > 0 else 0.0,
+            "metrics": {name: h.to_dict() for name, h in sorted(command_times.items())},
+        }, indent=2))
+        return
+    console.print()
+    console.print(ui.create_batch_summary(commands, seconds, command_times))
+    console.print()
 
 
 # Todo subcommands
@@ -379,6 +727,7 @@ def todo_add(
             new_timer = timer_manager.add_timer(title, timer, todo_id=todo.id)
             timer_manager.set_callbacks(on_complete=on_timer_complete)
 
+            import asyncio
             from rich.progress import Progress, BarColumn, TextColumn, TimeRemainingColumn, SpinnerColumn
 
             async def run_timer():
@@ -407,7 +756,11 @@ def todo_add(
             try:
                 asyncio.run(run_timer())
             except KeyboardInterrupt:
+                cancel_timer(new_timer.id)
                 console.print("\n[bold yellow]Timer cancelled.[/bold yellow]")
+            finally:
+                completions.close()
+                save_diagnostics()
     else:
         todo = todo_manager.add(title)
         ui.print_success(f"Todo '{title}' created [ID: {todo.id[:6]}]")
@@ -416,15 +769,50 @@ def todo_add(
 @todo_app.command("list")
 def todo_list(
     all: bool = typer.Option(False, "--all", "-a", help="Show all todos including completed"),
+    limit: Optional[int] = typer.Option(None, "--limit", "-n", min=0, help="Rows to show (default: fit the terminal, 0: all)"),
+    offset: int = typer.Option(0, "--offset", min=0, help="Rows to skip"),
 ):
     """List all todos."""
-    todos = todo_manager.list_all()
+    from itertools import islice
+
+    if limit is None:
+        limit = ui.page_size()
+    start = offset
+    stop = start + limit if limit else None
+
+    # Stream the file: the page is printed as soon as its rows are parsed,
+    # and the rest is only counted
+    page = []
+    total = shown = completed = 0
+    printed = False
     console.print()
-    console.print(ui.create_todo_table(todos, show_completed=all))
+    try:
+        for todo in storage.iter_todos():
+            total += 1
+            if todo.completed:
+                completed += 1
+            if all or not todo.completed:
+                if shown >= start and (stop is None or shown < stop):
+                    page.append(todo)
+                shown += 1
+                if shown == stop:
+                    console.print(ui.create_todo_table(page, show_completed=all))
+                    printed = True
+        if not printed:
+            if not page and shown and limit:
+                # Past the end: show the last page rather than an empty one
+                start = (shown - 1) // limit * limit
+                rows = storage.iter_todos(None if all else False)
+                page = list(islice(rows, start, start + limit))
+            console.print(ui.create_todo_table(page, show_completed=all))
+    except ValueError as e:
+        ui.print_error(str(e))
+        raise typer.Exit(1)
+    if page and (start > 0 or shown > len(page)):
+        console.print(f"[dim]Showing {start + 1}-{start + len(page)} of {shown}[/dim]")
     console.print()
 
-    counts = todo_manager.count()
-    console.print(f"[dim]Total: {counts['total']} | Pending: {counts['pending']} | Completed: {counts['completed']}[/dim]")
+    console.print(f"[dim]Total: {total} | Pending: {total - completed} | Completed: {completed}[/dim]")
 
 
 @todo_app.command("done")
@@ -432,7 +820,11 @@ def todo_done(
     todo_id: str = typer.Argument(..., help="Todo ID to mark as complete"),
 ):
     """Mark a todo as complete."""
-    todo = todo_manager.complete(todo_id)
+    try:
+        todo = todo_manager.complete(todo_id)
+    except AmbiguousIDError as e:
+        ui.print_error(str(e))
+        raise typer.Exit(1)
     if todo:
         ui.print_success(f"Todo '{todo.title}' marked as complete")
     else:
@@ -444,7 +836,12 @@ def todo_delete(
     todo_id: str = typer.Argument(..., help="Todo ID to delete"),
 ):
     """Delete a todo."""
-    if todo_manager.delete(todo_id):
+    try:
+        deleted = todo_manager.delete(todo_id)
+    except AmbiguousIDError as e:
+        ui.print_error(str(e))
+        raise typer.Exit(1)
+    if deleted:
         ui.print_success("Todo deleted")
     else:
         ui.print_error(f"Todo with ID '{todo_id}' not found")
@@ -457,6 +854,128 @@ def todo_clear():
     ui.print_success(f"Cleared {count} completed todo(s)")
 
 
+@app.command()
+def stats(
+    days: int = typer.Option(7, "--days", "-d", help="Days to show in the report"),
+):
+    """Show focus time, completion rate and streaks."""
+    summary = history.summary(days=max(days, 1))
+    console.print()
+    console.print(ui.create_stats_display(summary))
+    console.print()
+
+
+@app.command()
+def diag(
+    as_json: bool = typer.Option(False, "--json", help="Print the raw histograms as JSON"),
+):
+    """Show timer lateness, callback and render times from the last session."""
+    saved = Diagnostics.load(DIAG_FILE)
+    if saved is None:
+        ui.print_info("No diagnostics yet - they are saved when a session ends")
+        return
+    if as_json:
+        print(DIAG_FILE.read_text(encoding="utf-8"))
+        return
+    console.print()
+    console.print(ui.create_diag_table(saved))
+    console.print()
+
+
+@app.command(name="daemon")
+def run_daemon():
+    """Run a background daemon that owns timers and todos."""
+    import asyncio
+    from daemon import PomodoroDaemon
+
+    if not hasattr(asyncio, "start_unix_server"):
+        console.print("[bold red]Error:[/bold red] Daemon mode needs Unix domain sockets")
+        raise typer.Exit(1)
+
+    timer_manager.set_callbacks(on_complete=on_timer_complete)
+    timer_manager.restore()
+    daemon = PomodoroDaemon(SOCKET_PATH, todo_manager, timer_manager)
+    ui.print_info(f"Daemon listening on {SOCKET_PATH} (Ctrl+C to stop)")
+    try:
+        asyncio.run(daemon.serve())
+    except (RuntimeError, OSError) as e:
+        ui.print_error(str(e))
+        raise typer.Exit(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        completions.close()
+        todo_manager.close()
+        save_diagnostics()
+    console.print("[bold yellow]Daemon stopped.[/bold yellow]")
+
+
+def _ctl_request(cmd: str, **args) -> dict:
+    """Send a request to the daemon, exiting with an error on failure"""
+    from daemon import send_request
+
+    try:
+        response = send_request(SOCKET_PATH, cmd, **args)
+    except (ConnectionError, OSError) as e:
+        ui.print_error(f"{e}. Start one with 'pomodoro daemon'.")
+        raise typer.Exit(1)
+    if not response.get("ok"):
+        ui.print_error(response.get("error", "Request failed"))
+        raise typer.Exit(1)
+    return response
+
+
+@ctl_app.command("add")
+def ctl_add(
+    minutes: int = typer.Argument(25, help="Duration in minutes (default: 25)"),
+    title: str = typer.Argument("Focus Session", help="Timer title"),
+):
+    """Add and start a timer in the daemon."""
+    timer = _ctl_request("add", minutes=minutes, title=title)["timer"]
+    ui.print_success(f"Timer '{timer['title']}' ({minutes}m) started [ID: {timer['id'][:6]}]")
+
+
+@ctl_app.command("pause")
+def ctl_pause(timer_id: str = typer.Argument(..., help="Timer ID to pause")):
+    """Pause a daemon timer."""
+    _ctl_request("pause", id=timer_id)
+    ui.print_success("Timer paused")
+
+
+@ctl_app.command("resume")
+def ctl_resume(timer_id: str = typer.Argument(..., help="Timer ID to resume")):
+    """Resume a paused daemon timer."""
+    _ctl_request("resume", id=timer_id)
+    ui.print_success("Timer resumed")
+
+
+@ctl_app.command("done")
+def ctl_done(todo_id: str = typer.Argument(..., help="Todo ID to mark as complete")):
+    """Mark a todo as complete through the daemon."""
+    todo = _ctl_request("done", id=todo_id)["todo"]
+    ui.print_success(f"Todo '{todo['title']}' marked as complete")
+
+
+@ctl_app.command("status")
+def ctl_status():
+    """Show the daemon's active timers and pending todos."""
+    from daemon import timer_from_dict
+    from storage import Todo
+
+    response = _ctl_request("status")
+    console.print(ui.create_main_display(
+        [timer_from_dict(t) for t in response["timers"]],
+        [Todo.from_dict(t) for t in response["todos"]],
+    ))
+
+
+@ctl_app.command("stop")
+def ctl_stop():
+    """Stop the daemon."""
+    _ctl_request("stop")
+    ui.print_success("Daemon stopped")
+
+
 @app.callback(invoke_without_command=True)
 def main(ctx: typer.Context):
     """
@@ -467,6 +986,7 @@ def main(ctx: typer.Context):
     """
     if ctx.invoked_subcommand is None:
         # Default to interactive mode
+        import asyncio
         asyncio.run(interactive_mode())
 
 
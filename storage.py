@@ -2,16 +2,39 @@
 Storage module - Data models and JSON persistence
 """
 
+import atexit
 import json
+import math
 import os
+import re
+import sys
+import threading
+import time
 import uuid
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple, Union
 from pathlib import Path
 
+from index import pick_match
 
-@dataclass
+try:
+    import fcntl
+except ImportError:  # Windows: locking only covers threads of this process
+    fcntl = None
+
+
+# Slotted dataclasses drop the per-instance __dict__ (Python 3.10+)
+_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def new_id() -> str:
+    """Generate a short random ID"""
+    return str(uuid.uuid4())[:8]
+
+
+@dataclass(**_SLOTS)
 class Todo:
     """Todo item data model"""
     id: str
@@ -25,7 +48,7 @@ class Todo:
     def create(cls, title: str, timer_minutes: Optional[int] = None) -> "Todo":
         """Create a new todo item with auto-generated ID"""
         return cls(
-            id=str(uuid.uuid4())[:8],
+            id=new_id(),
             title=title,
             timer_minutes=timer_minutes,
         )
@@ -45,35 +68,57 @@ class Todo:
         return cls(**data)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Timer:
-    """Timer data model for active timers"""
+    """Timer data model for active timers
+
+    Remaining time is computed from a monotonic deadline rather than counted
+    down, so it does not drift when the event loop wakes up late.
+    """
     id: str
     title: str
     total_seconds: int
-    remaining_seconds: int
     started_at: str = field(default_factory=lambda: datetime.now().isoformat())
     todo_id: Optional[str] = None  # Associated todo ID
     paused: bool = False
+    deadline: Optional[float] = None  # time.monotonic() when the timer ends
+    paused_at: Optional[float] = None  # time.monotonic() when paused
+    paused_seconds: float = 0.0  # Total time spent paused
 
     @classmethod
     def create(cls, title: str, minutes: int, todo_id: Optional[str] = None) -> "Timer":
         """Create a new timer with auto-generated ID"""
-        total_seconds = minutes * 60
         return cls(
-            id=str(uuid.uuid4())[:8],
+            id=new_id(),
             title=title,
-            total_seconds=total_seconds,
-            remaining_seconds=total_seconds,
+            total_seconds=minutes * 60,
             todo_id=todo_id,
         )
 
+    @property
+    def started(self) -> bool:
+        """Check if the timer clock has been started"""
+        return self.deadline is not None
+
+    @property
+    def remaining_time(self) -> float:
+        """Get exact remaining time in seconds"""
+        if self.deadline is None:
+            return float(self.total_seconds)
+        now = self.paused_at if self.paused_at is not None else time.monotonic()
+        return max(0.0, self.deadline - now)
+
+    @property
+    def remaining_seconds(self) -> int:
+        """Get remaining whole seconds, rounded up"""
+        return math.ceil(self.remaining_time)
+
     @property
     def progress(self) -> float:
         """Get progress percentage (0.0 to 1.0)"""
         if self.total_seconds == 0:
             return 1.0
-        return (self.total_seconds - self.remaining_seconds) / self.total_seconds
+        return (self.total_seconds - self.remaining_time) / self.total_seconds
 
     @property
     def elapsed_seconds(self) -> int:
@@ -83,34 +128,314 @@ class Timer:
     @property
     def is_complete(self) -> bool:
         """Check if timer is complete"""
-        return self.remaining_seconds <= 0
+        return self.remaining_time <= 0
 
     def format_remaining(self) -> str:
         """Format remaining time as MM:SS"""
         mins, secs = divmod(self.remaining_seconds, 60)
         return f"{mins:02d}:{secs:02d}"
 
-    def tick(self) -> bool:
-        """Decrease remaining time by 1 second. Returns True if still running."""
-        if self.remaining_seconds > 0 and not self.paused:
-            self.remaining_seconds -= 1
-        return self.remaining_seconds > 0
+    def to_state(self) -> Dict[str, Any]:
+        """Convert to a dictionary that stays valid across restarts
+
+        The monotonic deadline means nothing to another process, so a
+        running timer is saved with its wall-clock end time instead.
+        """
+        running = self.started and not self.paused
+        return {
+            "id": self.id,
+            "title": self.title,
+            "total_seconds": self.total_seconds,
+            "started_at": self.started_at,
+            "todo_id": self.todo_id,
+            "paused": self.paused,
+            "paused_seconds": self.paused_seconds,
+            "started": self.started,
+            "remaining": None if running else self.remaining_time,
+            "ends_at": time.time() + self.remaining_time if running else None,
+        }
+
+    @classmethod
+    def from_state(cls, data: Dict[str, Any]) -> "Timer":
+        """Create Timer from a saved state, re-anchoring it to this clock"""
+        timer = cls(
+            id=data["id"],
+            title=data["title"],
+            total_seconds=data["total_seconds"],
+            started_at=data["started_at"],
+            todo_id=data["todo_id"],
+            paused=data["paused"],
+            paused_seconds=data["paused_seconds"],
+        )
+        if data["started"]:
+            now = time.monotonic()
+            if data["ends_at"] is not None:
+                timer.deadline = now + max(0.0, data["ends_at"] - time.time())
+            else:
+                timer.deadline = now + data["remaining"]
+                timer.paused_at = now
+        return timer
+
+    def start(self) -> None:
+        """Start the timer clock if it is not running yet"""
+        if self.deadline is None:
+            now = time.monotonic()
+            self.deadline = now + self.total_seconds
+            if self.paused:
+                self.paused_at = now
+
+    def pause(self) -> None:
+        """Freeze the remaining time"""
+        if not self.paused:
+            self.paused = True
+            if self.deadline is not None:
+                self.paused_at = time.monotonic()
+
+    def resume(self) -> None:
+        """Continue counting down, pushing the deadline back by the pause"""
+        if self.paused:
+            if self.paused_at is not None:
+                paused_for = time.monotonic() - self.paused_at
+                self.deadline += paused_for
+                self.paused_seconds += paused_for
+                self.paused_at = None
+            self.paused = False
+
+
+def _read_jsonl(path: Path, repair: bool = True) -> Iterator[Dict[str, Any]]:
+    """Yield records from a JSON-lines log, cutting off a torn final line
+
+    A crash mid-append leaves a partial last line; it is truncated away so
+    later appends do not land on a broken line. With repair=False the file
+    is only read: an unterminated last line (possibly an append still in
+    progress) is skipped and a broken line before it raises ValueError.
+    """
+    if not path.exists():
+        return
+    with open(path, "r+b" if repair else "rb") as f:
+        valid_end = 0
+        for line in f:
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("unterminated record")
+                record = json.loads(line)
+            except ValueError as e:
+                if repair:
+                    f.truncate(valid_end)
+                elif line.endswith(b"\n"):
+                    raise ValueError(f"{path} could not be read: {e}") from e
+                return
+            valid_end += len(line)
+            yield record
+
+
+def _dump_jsonl(records: List[Dict[str, Any]]) -> str:
+    """Serialize records as compact JSON lines"""
+    return "".join(
+        json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        for record in records
+    )
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _iter_json_array(f, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array as they are parsed
+
+    Only about one chunk of text is held at a time, instead of the whole
+    document and every decoded element.
+    """
+    decode = json.JSONDecoder().raw_decode
+    skip = _WHITESPACE.match
+    buf = ""
+    eof = False
+    while not eof and not buf.strip():
+        buf = f.read(chunk_size)
+        eof = not buf
+    pos = skip(buf).end()
+    if buf[pos:pos + 1] != "[":
+        raise json.JSONDecodeError("Expecting '['", buf, pos)
+    pos += 1
+    first = True
+
+    while True:
+        pos = skip(buf, pos).end()
+        if first and buf[pos:pos + 1] == "]":
+            return
+        # A value is only complete once its delimiter has been read (or the
+        # file ended), otherwise a number split across chunks decodes short
+        try:
+            value, end = decode(buf, pos)
+            end = skip(buf, end).end()
+            delimiter = buf[end:end + 1]
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            delimiter = ""
+        if delimiter == ",":
+            yield value
+            pos = end + 1
+            first = False
+        elif delimiter == "]":
+            yield value
+            return
+        elif eof:
+            raise json.JSONDecodeError("Expecting ',' delimiter", buf, end)
+        else:
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf = buf[pos:] + chunk
+            pos = 0
+
+
+# How hard writes try to survive a crash or power loss: "none" leaves
+# flushing to the OS, "file" fsyncs written files and "dir" also fsyncs
+# the directory so a rename is on disk before the write returns
+DURABILITY_LEVELS = ("none", "file", "dir")
+
+
+def _fsync_dir(path: Path) -> None:
+    """Flush a directory entry to disk, where the platform allows it"""
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return  # Directories cannot be opened on Windows
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _atomic_write(path: Path, data: Union[str, bytes], durability: str = "file") -> None:
+    """Replace a file via a temporary file and rename
+
+    Readers see either the old or the new contents, never a partial write.
+    The temporary name is unique to the writing process and thread, so
+    writers that do not share a lock cannot clobber each other's file.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    tmp_file = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_file, "wb") as f:
+            f.write(data)
+            if durability != "none":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    if durability == "dir":
+        _fsync_dir(path.parent)
 
 
 class Storage:
-    """JSON file storage for todos"""
+    """JSON file storage for todos
 
-    def __init__(self, data_dir: str = "data"):
+    todos.json is replaced atomically on every save; durability picks how
+    much fsyncing each write does (see DURABILITY_LEVELS). Several processes
+    can share the data directory: callers hold lock() around
+    read-modify-write cycles and use is_stale() to reload only when another
+    process changed the files.
+    """
+
+    # Backends that can filter and count todos themselves set this, and
+    # TodoManager then queries them instead of keeping every todo in memory
+    supports_queries = False
+
+    def __init__(self, data_dir: str = "data", durability: str = "file"):
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability level: {durability}")
         self.data_dir = Path(data_dir)
         self.todos_file = self.data_dir / "todos.json"
+        self.durability = durability
+        self.lock_file = self.data_dir / "todos.lock"
+        self._lock_mutex = threading.RLock()
+        self._lock_depth = 0
+        self._lock_fd: Optional[int] = None
+        self._seen_stamp: Optional[tuple] = None
         self._ensure_data_dir()
 
     def _ensure_data_dir(self) -> None:
         """Create data directory if it doesn't exist"""
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold the data directory lock; re-entrant within this process"""
+        with self._lock_mutex:
+            if self._lock_depth == 0 and fcntl is not None:
+                self._ensure_data_dir()
+                self._lock_fd = os.open(str(self.lock_file), os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0 and self._lock_fd is not None:
+                    os.close(self._lock_fd)  # Also releases the flock
+                    self._lock_fd = None
+
+    def _watched_files(self) -> List[Path]:
+        """Files whose changes mean the loaded todos are out of date"""
+        return [self.todos_file]
+
+    def _stamp(self) -> tuple:
+        """Identity, size and mtime of the watched files"""
+        stamp = []
+        for path in self._watched_files():
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                stamp.append(None)
+            else:
+                stamp.append((st.st_ino, st.st_size, st.st_mtime_ns))
+        return tuple(stamp)
+
+    def _mark_seen(self) -> None:
+        """Record the files as read or written by this process"""
+        self._seen_stamp = self._stamp()
+
+    def is_stale(self) -> bool:
+        """Check whether another process changed the files since we last read or wrote them"""
+        return self._stamp() != self._seen_stamp
+
     def load_todos(self) -> List[Todo]:
         """Load todos from JSON file"""
+        try:
+            return self._read_snapshot()
+        finally:
+            self._mark_seen()
+
+    def iter_todos(self, completed: Optional[bool] = None) -> Iterator[Todo]:
+        """Yield todos as the file is parsed, without loading it whole
+
+        completed=False yields only pending todos and completed=True only
+        completed ones; the rest are skipped before a Todo is built.
+
+        This is a read-only path: an unreadable file raises ValueError and
+        is left in place (load_todos is the one that moves it aside).
+        """
+        if not self.todos_file.exists():
+            return
+
+        try:
+            with open(self.todos_file, "r", encoding="utf-8") as f:
+                for item in _iter_json_array(f):
+                    if completed is None or item.get("completed", False) == completed:
+                        yield Todo.from_dict(item)
+        except (json.JSONDecodeError, KeyError) as e:
+            raise ValueError(f"{self.todos_file} could not be read: {e}") from e
+
+    def _read_snapshot(self) -> List[Todo]:
+        """Read todos from the JSON file
+
+        Parsing the whole document at once is faster than streaming when
+        every todo is needed anyway.
+        """
         if not self.todos_file.exists():
             return []
 
@@ -118,16 +443,542 @@ class Storage:
             with open(self.todos_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
                 return [Todo.from_dict(item) for item in data]
-        except (json.JSONDecodeError, KeyError) as e:
-            # Return empty list if file is corrupted
+        except (json.JSONDecodeError, KeyError):
+            # Keep the damaged file for recovery instead of overwriting it
+            # with the next save
+            self._move_aside(self.todos_file)
             return []
 
+    @staticmethod
+    def _move_aside(path: Path) -> None:
+        """Rename an unreadable file so it is not overwritten"""
+        backup = path.with_name(f"{path.name}.corrupt-{datetime.now():%Y%m%d%H%M%S}")
+        os.replace(path, backup)
+        print(f"Warning: {path} could not be read and was moved to {backup}", file=sys.stderr)
+
     def save_todos(self, todos: List[Todo]) -> None:
         """Save todos to JSON file"""
+        self._write_snapshot([todo.to_dict() for todo in todos])
+
+    def _write_snapshot(self, items: List[Dict[str, Any]]) -> None:
+        """Atomically replace the JSON file with serialized todos"""
         self._ensure_data_dir()
-        with open(self.todos_file, "w", encoding="utf-8") as f:
-            json.dump([todo.to_dict() for todo in todos], f, ensure_ascii=False, indent=2)
+        _atomic_write(
+            self.todos_file,
+            json.dumps(items, ensure_ascii=False, indent=2),
+            self.durability,
+        )
+        self._mark_seen()
+
+    def save_changes(self, op: str, changed: List[Todo], todos: List[Todo]) -> None:
+        """Persist a mutation of some todos
+
+        op is "add", "update" or "delete" and changed holds the affected
+        todos; todos is the full list after the change.
+        """
+        self.save_batch([(op, changed)], todos)
+
+    def save_batch(self, changes: List[Tuple[str, List[Todo]]], todos: List[Todo]) -> None:
+        """Persist several mutations, in order, as one write
+
+        The JSON file can only be rewritten as a whole, so this saves
+        everything once.
+        """
+        self.save_todos(todos)
 
     def clear_todos(self) -> None:
         """Clear all todos"""
         self.save_todos([])
+
+
+class JournalStorage(Storage):
+    """JSON snapshot plus an append-only journal of todo mutations
+
+    Each mutation appends one compact JSON line to todos.journal instead of
+    rewriting todos.json. Loading replays the journal over the snapshot, and
+    once the journal grows past compact_threshold records it is folded into
+    a new snapshot on a background thread. A compaction still running when
+    the process exits is waited for, so short CLI runs finish theirs.
+    """
+
+    def __init__(self, data_dir: str = "data", durability: str = "file", compact_threshold: int = 1000):
+        super().__init__(data_dir, durability)
+        self.journal_file = self.data_dir / "todos.journal"
+        self.compact_threshold = compact_threshold
+        self._records = 0
+        self._lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        self._exit_hook = False
+        self._generation = 0  # Bumped by full saves to void running compactions
+
+    def _watched_files(self) -> List[Path]:
+        """Both the snapshot and the journal"""
+        return [self.todos_file, self.journal_file]
+
+    def load_todos(self) -> List[Todo]:
+        """Load the snapshot and replay the journal on top of it"""
+        todos: Dict[str, Todo] = {}
+        for todo in self._read_snapshot():
+            todos.setdefault(todo.id, todo)
+
+        self._records = 0
+        for record in _read_jsonl(self.journal_file):
+            self._replay(todos, record)
+            self._records += 1
+
+        self._mark_seen()
+        return list(todos.values())
+
+    def iter_todos(self, completed: Optional[bool] = None) -> Iterator[Todo]:
+        """Stream the snapshot with the journal replayed over it
+
+        Read-only like Storage.iter_todos: nothing is moved aside or
+        truncated, and an unreadable file raises ValueError. The journal is
+        read into memory first; it is small next to the snapshot.
+        """
+        snapshot = None
+        journal: Dict[str, Optional[Todo]] = {}
+        with self.lock():
+            # The open handle keeps this snapshot even if a compaction
+            # replaces the file while it is being streamed
+            try:
+                snapshot = open(self.todos_file, "r", encoding="utf-8")
+            except FileNotFoundError:
+                pass
+            try:
+                for record in _read_jsonl(self.journal_file, repair=False):
+                    if record["op"] == "delete":
+                        # A todo deleted and re-added moves to the end
+                        journal.pop(record["id"], None)
+                        journal[record["id"]] = None
+                    else:
+                        todo = Todo.from_dict(record["todo"])
+                        journal[todo.id] = todo
+            except (ValueError, KeyError) as e:
+                if snapshot is not None:
+                    snapshot.close()
+                raise ValueError(f"{self.journal_file} could not be read: {e}") from e
+
+        seen = set()
+        if snapshot is not None:
+            with snapshot:
+                try:
+                    for item in _iter_json_array(snapshot):
+                        todo_id = item["id"]
+                        if todo_id in seen:
+                            continue
+                        seen.add(todo_id)
+                        if todo_id in journal:
+                            todo = journal[todo_id]
+                            if todo is not None and (completed is None or todo.completed == completed):
+                                yield todo
+                        elif completed is None or item.get("completed", False) == completed:
+                            yield Todo.from_dict(item)
+                except (json.JSONDecodeError, KeyError) as e:
+                    raise ValueError(f"{self.todos_file} could not be read: {e}") from e
+        for todo_id, todo in journal.items():
+            if todo is not None and todo_id not in seen and (completed is None or todo.completed == completed):
+                yield todo
+
+    @staticmethod
+    def _replay(todos: Dict[str, Todo], record: Dict[str, Any]) -> None:
+        """Apply one journal record; replaying a record twice is harmless"""
+        if record["op"] == "delete":
+            todos.pop(record["id"], None)
+        else:
+            todo = Todo.from_dict(record["todo"])
+            todos[todo.id] = todo
+
+    def save_todos(self, todos: List[Todo]) -> None:
+        """Write a full snapshot and empty the journal"""
+        with self.lock(), self._lock:
+            self._generation += 1
+            super().save_todos(todos)
+            open(self.journal_file, "w", encoding="utf-8").close()
+            self._records = 0
+            self._mark_seen()
+
+    def save_batch(self, changes: List[Tuple[str, List[Todo]]], todos: List[Todo]) -> None:
+        """Append one journal record per changed todo in a single write"""
+        records = []
+        for op, changed in changes:
+            if op == "delete":
+                records.extend({"op": op, "id": todo.id} for todo in changed)
+            else:
+                records.extend({"op": op, "todo": todo.to_dict()} for todo in changed)
+        if not records:
+            return
+
+        lines = _dump_jsonl(records)
+        with self.lock(), self._lock:
+            self._ensure_data_dir()
+            with open(self.journal_file, "a", encoding="utf-8") as f:
+                f.write(lines)
+                if self.durability != "none":
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._records += len(records)
+            self._mark_seen()
+
+        if self._records >= self.compact_threshold:
+            self.compact(todos)
+
+    def compact(self, todos: List[Todo]) -> None:
+        """Fold the journal into a new snapshot on a background thread"""
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+
+        with self._lock:
+            items = [todo.to_dict() for todo in todos]
+            offset = self.journal_file.stat().st_size if self.journal_file.exists() else 0
+            self._records = 0
+            generation = self._generation
+
+        self._compactor = threading.Thread(
+            target=self._write_compacted,
+            args=(items, offset, generation),
+            name="journal-compactor",
+            daemon=True,
+        )
+        self._compactor.start()
+        if not self._exit_hook:
+            # Daemon threads die at exit; without this a one-shot command
+            # would start a compaction and kill it every time
+            atexit.register(self.wait_compaction)
+            self._exit_hook = True
+
+    def _write_compacted(self, items: List[Dict[str, Any]], offset: int, generation: int) -> None:
+        """Replace the snapshot and drop journal records it already covers"""
+        data = json.dumps(items, ensure_ascii=False, indent=2)
+        with self.lock(), self._lock:
+            # A full save or another process got there first, so the
+            # snapshot or the journal offset no longer match the files
+            if generation != self._generation or self.is_stale():
+                return
+            _atomic_write(self.todos_file, data, self.durability)
+            # Records appended while the snapshot was written must survive
+            with open(self.journal_file, "rb") as f:
+                f.seek(offset)
+                tail = f.read()
+            _atomic_write(self.journal_file, tail, self.durability)
+            self._mark_seen()
+
+    def wait_compaction(self) -> None:
+        """Block until a running background compaction has finished"""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+            self._compactor = None
+
+
+class SQLiteStorage(Storage):
+    """SQLite database storage for todos
+
+    Todos live in data/todos.db (WAL mode) with indexes on id, completed and
+    created_at, so filtering, counting and prefix lookups run in SQL and
+    only the requested rows are turned into Todo objects. An existing
+    todos.json is imported the first time the database is created.
+    """
+
+    supports_queries = True
+
+    _COLUMNS = ("id", "title", "completed", "created_at", "completed_at", "timer_minutes")
+
+    # SQLite's own syncing settings for each durability level
+    _SYNCHRONOUS = {"none": "OFF", "file": "NORMAL", "dir": "FULL"}
+
+    def __init__(self, data_dir: str = "data", durability: str = "file"):
+        super().__init__(data_dir, durability)
+        import sqlite3  # Only paid for by users of this backend
+
+        self.db_file = self.data_dir / "todos.db"
+        is_new = not self.db_file.exists()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={self._SYNCHRONOUS[durability]}")
+        self._create_schema()
+        if is_new and self.todos_file.exists():
+            self.save_todos(super().load_todos())
+
+    def lock(self):
+        """SQLite does its own locking between processes"""
+        return nullcontext()
+
+    def is_stale(self) -> bool:
+        """Queries always read the database, so nothing goes stale"""
+        return False
+
+    def _create_schema(self) -> None:
+        """Create the todos table and its indexes"""
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS todos (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    completed INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL,
+                    completed_at TEXT,
+                    timer_minutes INTEGER
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_todos_id ON todos(id);
+                CREATE INDEX IF NOT EXISTS idx_todos_completed ON todos(completed);
+                CREATE INDEX IF NOT EXISTS idx_todos_created_at ON todos(created_at);
+            """)
+
+    @staticmethod
+    def _to_row(todo: Todo) -> tuple:
+        """Convert a todo to column values"""
+        return (todo.id, todo.title, int(todo.completed), todo.created_at,
+                todo.completed_at, todo.timer_minutes)
+
+    @staticmethod
+    def _from_row(row: tuple) -> Todo:
+        """Create Todo from column values"""
+        todo_id, title, completed, created_at, completed_at, timer_minutes = row
+        return Todo(
+            id=todo_id,
+            title=title,
+            completed=bool(completed),
+            created_at=created_at,
+            completed_at=completed_at,
+            timer_minutes=timer_minutes,
+        )
+
+    def _select(self, where: str = "", params: tuple = ()) -> List[Todo]:
+        """Run a filtered SELECT and build Todo objects for the rows"""
+        sql = f"SELECT {', '.join(self._COLUMNS)} FROM todos {where} ORDER BY seq"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def load_todos(self) -> List[Todo]:
+        """Load all todos from the database"""
+        return self._select()
+
+    def save_todos(self, todos: List[Todo]) -> None:
+        """Replace all todos in the database"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM todos")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO todos (id, title, completed, created_at, completed_at, timer_minutes) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [self._to_row(todo) for todo in todos],
+            )
+
+    def save_batch(self, changes: List[Tuple[str, List[Todo]]], todos: List[Todo]) -> None:
+        """Insert, update or delete only the changed rows in one transaction"""
+        with self._lock, self._conn:
+            for op, changed in changes:
+                if op == "delete":
+                    self._conn.executemany(
+                        "DELETE FROM todos WHERE id = ?",
+                        [(todo.id,) for todo in changed],
+                    )
+                elif op == "add":
+                    self._conn.executemany(
+                        "INSERT INTO todos (id, title, completed, created_at, completed_at, timer_minutes) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        [self._to_row(todo) for todo in changed],
+                    )
+                else:
+                    self._conn.executemany(
+                        "UPDATE todos SET title = ?, completed = ?, created_at = ?, "
+                        "completed_at = ?, timer_minutes = ? WHERE id = ?",
+                        [self._to_row(todo)[1:] + (todo.id,) for todo in changed],
+                    )
+
+    def iter_todos(self, completed: Optional[bool] = None) -> Iterator[Todo]:
+        """Yield todos from a query"""
+        return iter(self.query_todos(completed))
+
+    def query_todos(self, completed: Optional[bool] = None) -> List[Todo]:
+        """Get todos in insertion order, optionally filtered by status"""
+        if completed is None:
+            return self._select()
+        return self._select("WHERE completed = ?", (int(completed),))
+
+    def get_todo(self, todo_id: str) -> Optional[Todo]:
+        """Get a todo by exact ID"""
+        todos = self._select("WHERE id = ?", (todo_id,))
+        return todos[0] if todos else None
+
+    def resolve_id(self, prefix: str) -> Optional[str]:
+        """Resolve an exact ID or unique prefix to a full ID
+
+        Raises AmbiguousIDError if the prefix matches several todos.
+        """
+        if not prefix:
+            return None
+        # Range scan on the id index; LIKE would not use it
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM todos WHERE id >= ? AND id < ? ORDER BY id LIMIT 6",
+                (prefix, upper),
+            ).fetchall()
+        candidates = [row[0] for row in rows]
+        if prefix in candidates:
+            return prefix
+        return pick_match(prefix, candidates)
+
+    def count_todos(self) -> Dict[str, int]:
+        """Count pending and completed todos"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT completed, COUNT(*) FROM todos GROUP BY completed"
+            ).fetchall()
+        counts = {bool(completed): n for completed, n in rows}
+        pending = counts.get(False, 0)
+        completed = counts.get(True, 0)
+        return {
+            "total": pending + completed,
+            "pending": pending,
+            "completed": completed,
+        }
+
+    def delete_completed(self) -> int:
+        """Delete all completed todos, return count removed"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM todos WHERE completed = 1")
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._conn.close()
+
+
+def _process_alive(pid: int) -> bool:
+    """Check whether a process with this ID is still running"""
+    if sys.platform == "win32":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+            return code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Running, but as another user
+    return True
+
+
+class TimerStore:
+    """Checkpoint file for in-flight timers
+
+    Every timer state change appends one line to timers.jsonl, so a crash
+    loses nothing and a checkpoint costs a single small write. The log is
+    rewritten with one line per live timer when loaded and whenever stale
+    records start to outnumber live ones.
+
+    Several processes may share the file. Each record names the process
+    that owns the timer, and load() only claims timers whose owner has
+    exited, so a second app never runs another's live timers. Appends and
+    rewrites hold timers.lock, and rewrites start from the file on disk
+    so other processes' records survive.
+    """
+
+    def __init__(self, data_dir: str = "data"):
+        self.data_dir = Path(data_dir)
+        self.state_file = self.data_dir / "timers.jsonl"
+        self.lock_file = self.data_dir / "timers.lock"
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._records = 0
+        self._live = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the file lock against other processes and threads"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            fd = os.open(str(self.lock_file), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)  # Also releases the flock
+
+    def _read(self) -> Dict[str, Tuple[Optional[int], Dict[str, Any]]]:
+        """Replay the log into the owner and state of every live timer"""
+        states: Dict[str, Tuple[Optional[int], Dict[str, Any]]] = {}
+        for record in _read_jsonl(self.state_file):
+            if record["op"] == "remove":
+                states.pop(record["id"], None)
+            else:
+                states[record["timer"]["id"]] = (record.get("owner"), record["timer"])
+        return states
+
+    def load(self) -> List[Timer]:
+        """Claim saved timers whose process has exited, and compact the log"""
+        me = os.getpid()
+        with self._locked():
+            states = self._read()
+            claimed = {}
+            for timer_id, (owner, state) in states.items():
+                if owner is None or owner == me or not _process_alive(owner):
+                    states[timer_id] = (me, state)
+                    claimed[timer_id] = state
+            self._states = claimed
+            self._write(states)
+        return [Timer.from_state(state) for state in claimed.values()]
+
+    def put(self, timer: Timer) -> None:
+        """Checkpoint a timer's current state"""
+        state = timer.to_state()
+        with self._locked():
+            self._states[timer.id] = state
+            self._append({"op": "put", "owner": os.getpid(), "timer": state})
+
+    def remove(self, timer_id: str) -> None:
+        """Forget a finished or cancelled timer"""
+        with self._locked():
+            if self._states.pop(timer_id, None) is not None:
+                self._append({"op": "remove", "id": timer_id})
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Append one record, compacting when the log is mostly stale"""
+        if self._records > 2 * max(self._live, len(self._states)) + 64:
+            self._write(self._read())
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.state_file, "a", encoding="utf-8") as f:
+            f.write(_dump_jsonl([record]))
+        self._records += 1
+
+    def _write(self, states: Dict[str, Tuple[Optional[int], Dict[str, Any]]]) -> None:
+        """Replace the log with one record per live timer"""
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        records = [
+            {"op": "put", "owner": owner, "timer": state}
+            for owner, state in states.values()
+        ]
+        _atomic_write(self.state_file, _dump_jsonl(records), "none")
+        self._records = self._live = len(records)
+
+
+STORAGE_BACKENDS = {
+    "json": Storage,
+    "journal": JournalStorage,
+    "sqlite": SQLiteStorage,
+}
+
+
+def create_storage(backend: str = "json", data_dir: str = "data", durability: str = "file") -> Storage:
+    """Create a storage instance for the named backend"""
+    try:
+        storage_cls = STORAGE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown storage backend: {backend}")
+    return storage_cls(data_dir, durability)
@@ -0,0 +1,44 @@
+"""
+Tests - TodoManager write-behind buffering across processes
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from storage import create_storage
+from todo import TodoManager
+
+
+class BufferedUpdateTest(unittest.TestCase):
+    """A buffered update must not bring back a todo deleted elsewhere"""
+
+    def check_backend(self, backend: str) -> None:
+        with tempfile.TemporaryDirectory() as data_dir:
+            other = TodoManager(create_storage(backend, data_dir))
+            todo = other.add("Write report")
+
+            buffered = TodoManager(create_storage(backend, data_dir), flush_interval=60)
+            buffered.complete(todo.id)
+            other.delete(todo.id)
+            buffered.close()
+
+            self.assertIsNone(buffered.get(todo.id))
+            fresh = TodoManager(create_storage(backend, data_dir))
+            self.assertEqual(fresh.list_all(), [])
+
+    def test_json(self):
+        self.check_backend("json")
+
+    def test_journal(self):
+        self.check_backend("journal")
+
+    def test_sqlite(self):
+        self.check_backend("sqlite")
+
+
+if __name__ == "__main__":
+    unittest.main()
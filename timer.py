@@ -3,26 +3,296 @@ Timer module - Async timer management for parallel timers
 """
 
 import asyncio
-from typing import Dict, List, Optional, Callable, Any
-from storage import Timer
+import heapq
+import math
+import time
+from typing import Dict, List, Optional, Callable, Any, Tuple
+from storage import Timer, TimerStore, new_id
+from index import PrefixIndex
+from diag import Diagnostics
 
 
-class TimerManager:
-    """Manages multiple timers running in parallel"""
+# Timer engines: one coroutine per timer, or a single deadline scheduler
+ENGINES = ("tasks", "scheduler")
+
+
+class _DeadlineHeap:
+    """Deadline-ordered heap of running timers with lazy cancellation"""
 
     def __init__(self):
+        self._heap: List[Tuple[float, str]] = []
+        self._deadlines: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, timer_id: str) -> bool:
+        return timer_id in self._deadlines
+
+    def push(self, timer_id: str, deadline: float) -> None:
+        """Schedule (or reschedule) a timer to complete at deadline"""
+        self._deadlines[timer_id] = deadline
+        heapq.heappush(self._heap, (deadline, timer_id))
+        # Superseded entries are skipped lazily; rebuild if they pile up
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [(d, tid) for tid, d in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+    def discard(self, timer_id: str) -> None:
+        """Unschedule a timer; its heap entry becomes stale"""
+        self._deadlines.pop(timer_id, None)
+
+    def deadline(self, timer_id: str) -> Optional[float]:
+        """Get the scheduled deadline of a timer"""
+        return self._deadlines.get(timer_id)
+
+    def peek(self) -> Optional[float]:
+        """Get the earliest live deadline, dropping stale entries"""
+        while self._heap:
+            deadline, timer_id = self._heap[0]
+            if self._deadlines.get(timer_id) == deadline:
+                return deadline
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: float) -> List[str]:
+        """Remove and return IDs of all timers due at or before now"""
+        due = []
+        while True:
+            deadline = self.peek()
+            if deadline is None or deadline > now:
+                break
+            _, timer_id = heapq.heappop(self._heap)
+            del self._deadlines[timer_id]
+            due.append(timer_id)
+        return due
+
+    def clear(self) -> None:
+        """Unschedule all timers"""
+        self._heap.clear()
+        self._deadlines.clear()
+
+    def items(self) -> List[Tuple[str, float]]:
+        """Get (timer ID, deadline) pairs of all scheduled timers"""
+        return list(self._deadlines.items())
+
+
+class _TimingWheel:
+    """Hashed hierarchical timing wheel of running timers
+
+    Same interface as _DeadlineHeap, but add, cancel and pause are O(1)
+    dict operations. Time is cut into ticks of `resolution` seconds; level
+    0 holds timers due within `slots` ticks, each higher level covers
+    `slots` times the span of the one below, and anything beyond the top
+    level waits in an overflow bucket. When the wheel passes a slot of a
+    higher level, its timers cascade down. Timers fire at the first tick
+    boundary at or after their deadline, i.e. at most one tick late.
+    """
+
+    def __init__(self, resolution: float = 0.05, slots: int = 64, levels: int = 4,
+                 start: Optional[float] = None):
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self._spans = [slots ** level for level in range(levels + 1)]
+        self._wheels: List[List[Dict[str, float]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._overflow: Dict[str, float] = {}
+        self._due: Dict[str, float] = {}
+        self._buckets: Dict[str, Dict[str, float]] = {}  # Timer ID -> its bucket
+        now = time.monotonic() if start is None else start
+        self._tick = math.floor(now / resolution)  # Last processed tick
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def __contains__(self, timer_id: str) -> bool:
+        return timer_id in self._buckets
+
+    def _place(self, timer_id: str, deadline: float) -> None:
+        """Put a timer in the bucket for its due tick"""
+        due_tick = math.ceil(deadline / self.resolution)
+        bucket = self._due if due_tick <= self._tick else self._overflow
+        if due_tick > self._tick:
+            for level in range(self.levels):
+                span = self._spans[level]
+                if due_tick // span - self._tick // span < self.slots:
+                    bucket = self._wheels[level][(due_tick // span) % self.slots]
+                    break
+        bucket[timer_id] = deadline
+        self._buckets[timer_id] = bucket
+
+    def push(self, timer_id: str, deadline: float) -> None:
+        """Schedule (or reschedule) a timer to complete at deadline"""
+        self.discard(timer_id)
+        self._place(timer_id, deadline)
+
+    def discard(self, timer_id: str) -> None:
+        """Unschedule a timer"""
+        bucket = self._buckets.pop(timer_id, None)
+        if bucket is not None:
+            del bucket[timer_id]
+
+    def deadline(self, timer_id: str) -> Optional[float]:
+        """Get the scheduled deadline of a timer"""
+        bucket = self._buckets.get(timer_id)
+        return None if bucket is None else bucket[timer_id]
+
+    def peek(self) -> Optional[float]:
+        """Get the next time the wheel has work: a timer due or a cascade"""
+        if self._due:
+            return min(self._due.values())
+        next_tick = self._next_tick()
+        return None if next_tick is None else next_tick * self.resolution
+
+    def _next_tick(self) -> Optional[int]:
+        """Find the next tick that expires or cascades a non-empty slot"""
+        next_tick = None
+        for level in range(self.levels):
+            span = self._spans[level]
+            wheel = self._wheels[level]
+            base = self._tick // span
+            for step in range(1, self.slots + 1):
+                if wheel[(base + step) % self.slots]:
+                    tick = (base + step) * span
+                    if next_tick is None or tick < next_tick:
+                        next_tick = tick
+                    break
+        if self._overflow:
+            top = self._spans[self.levels]
+            tick = (self._tick // top + 1) * top
+            if next_tick is None or tick < next_tick:
+                next_tick = tick
+        return next_tick
+
+    def pop_due(self, now: float) -> List[str]:
+        """Remove and return IDs of all timers due at or before now"""
+        now_tick = math.floor(now / self.resolution)
+        while self._tick < now_tick:
+            # Jump over ticks where nothing expires or cascades
+            next_tick = self._next_tick()
+            if next_tick is None or next_tick > now_tick:
+                self._tick = now_tick
+                break
+            self._tick = next_tick - 1
+            self._advance()
+
+        due = list(self._due)
+        for timer_id in due:
+            del self._buckets[timer_id]
+        self._due.clear()
+        return due
+
+    def _advance(self) -> None:
+        """Process the next tick: cascade higher levels, expire level 0"""
+        self._tick += 1
+        tick = self._tick
+
+        if tick % self._spans[self.levels] == 0 and self._overflow:
+            self._cascade(self._overflow)
+        for level in range(self.levels - 1, 0, -1):
+            span = self._spans[level]
+            if tick % span == 0:
+                self._cascade(self._wheels[level][(tick // span) % self.slots])
+
+        slot = self._wheels[0][tick % self.slots]
+        if slot:
+            for timer_id, deadline in slot.items():
+                self._due[timer_id] = deadline
+                self._buckets[timer_id] = self._due
+            slot.clear()
+
+    def _cascade(self, bucket: Dict[str, float]) -> None:
+        """Re-place every timer of a bucket relative to the current tick"""
+        entries = list(bucket.items())
+        bucket.clear()
+        for timer_id, deadline in entries:
+            self._place(timer_id, deadline)
+
+    def clear(self) -> None:
+        """Unschedule all timers"""
+        for wheel in self._wheels:
+            for slot in wheel:
+                slot.clear()
+        self._overflow.clear()
+        self._due.clear()
+        self._buckets.clear()
+
+    def items(self) -> List[Tuple[str, float]]:
+        """Get (timer ID, deadline) pairs of all scheduled timers"""
+        return [(timer_id, bucket[timer_id]) for timer_id, bucket in self._buckets.items()]
+
+
+class TimerManager:
+    """Manages multiple timers running in parallel
+
+    The "tasks" engine runs one coroutine per timer that wakes once per
+    displayed second.
+    The "scheduler" engine keeps running timers in a deadline heap and a
+    single coroutine sleeps until the next completion, so idle cost does not
+    grow with the number of timers. While on_tick is set and timers are
+    scheduled, one loop timer calls it once a second for the display
+    without visiting the timers.
+
+    If wheel_threshold is set, the scheduler moves its timers into a
+    hierarchical timing wheel once more than that many are running (and back
+    to the heap below half of it), trading a little precision for O(1)
+    add, cancel and pause at very large timer counts.
+
+    With a TimerStore, every state change is checkpointed so timers can be
+    restored after a restart.
+
+    Ticks are coalesced: on_tick receives the timers that changed since its
+    last call, at most tick_rate times per second, however many timers are
+    running.
+
+    With Diagnostics attached, wakeup lateness and callback durations are
+    recorded into its histograms.
+    """
+
+    def __init__(
+        self,
+        engine: str = "tasks",
+        store: Optional[TimerStore] = None,
+        wheel_threshold: Optional[int] = None,
+        tick_rate: Optional[float] = 4.0,
+        diagnostics: Optional[Diagnostics] = None,
+    ):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown timer engine: {engine}")
+        self.engine = engine
+        self.store = store
+        self.wheel_threshold = wheel_threshold
         self.timers: Dict[str, Timer] = {}
+        self._index = PrefixIndex()
         self.tasks: Dict[str, asyncio.Task] = {}
-        self._on_tick: Optional[Callable[[], None]] = None
+        self.tick_rate = tick_rate
+        self.diagnostics = diagnostics
+        self._ticked: Dict[str, Timer] = {}
+        self._tick_handle: Optional[asyncio.TimerHandle] = None
+        self._last_tick = 0.0
+        self._on_tick: Optional[Callable[[List[Timer]], None]] = None
         self._on_complete: Optional[Callable[[Timer], None]] = None
         self._running = False
+        self._schedule: Any = _DeadlineHeap()
+        self._scheduler_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._display_handle: Optional[asyncio.TimerHandle] = None
+        self._display_at = 0.0
+        self._display_due = False
 
     def set_callbacks(
         self,
-        on_tick: Optional[Callable[[], None]] = None,
+        on_tick: Optional[Callable[[List[Timer]], None]] = None,
         on_complete: Optional[Callable[[Timer], None]] = None,
     ) -> None:
-        """Set callback functions for timer events"""
+        """Set callback functions for timer events
+
+        on_tick is called with the list of timers that changed. With the
+        scheduler engine the list may be empty: that once-a-second call
+        means every running timer's countdown moved on.
+        """
         self._on_tick = on_tick
         self._on_complete = on_complete
 
@@ -34,18 +304,38 @@ class TimerManager:
     ) -> Timer:
         """Add a new timer and start it if manager is running"""
         timer = Timer.create(title=title, minutes=minutes, todo_id=todo_id)
+        while timer.id in self.timers:
+            timer.id = new_id()
         self.timers[timer.id] = timer
+        self._index.add(timer.id)
+        self._checkpoint(timer)
         return timer
 
-    def remove_timer(self, timer_id: str) -> bool:
-        """Remove a timer by ID"""
-        # Find timer with matching ID or prefix
-        target_id = None
-        for tid in self.timers:
-            if tid == timer_id or tid.startswith(timer_id):
-                target_id = tid
-                break
+    def restore(self) -> List[Timer]:
+        """Load checkpointed timers from the store, return those added"""
+        if self.store is None:
+            return []
+        restored = []
+        for timer in self.store.load():
+            if timer.id not in self.timers:
+                self.timers[timer.id] = timer
+                self._index.add(timer.id)
+                restored.append(timer)
+        return restored
+
+    def _checkpoint(self, timer: Timer) -> None:
+        """Save a timer's state if a store is attached"""
+        if self.store is not None:
+            self.store.put(timer)
 
+    def _forget(self, timer_id: str) -> None:
+        """Drop a finished or removed timer from the store"""
+        if self.store is not None:
+            self.store.remove(timer_id)
+
+    def remove_timer(self, timer_id: str) -> bool:
+        """Remove a timer by ID or unique prefix"""
+        target_id = self._index.resolve(timer_id)
         if target_id is None:
             return False
 
@@ -53,16 +343,22 @@ class TimerManager:
         if target_id in self.tasks:
             self.tasks[target_id].cancel()
             del self.tasks[target_id]
+        self._schedule.discard(target_id)
 
         del self.timers[target_id]
+        self._index.discard(target_id)
+        self._forget(target_id)
         return True
 
     def get_timer(self, timer_id: str) -> Optional[Timer]:
-        """Get a timer by ID"""
-        for tid, timer in self.timers.items():
-            if tid == timer_id or tid.startswith(timer_id):
-                return timer
-        return None
+        """Get a timer by ID or unique prefix
+
+        Raises AmbiguousIDError if the prefix matches several timers.
+        """
+        target_id = self._index.resolve(timer_id)
+        if target_id is None:
+            return None
+        return self.timers[target_id]
 
     def get_active_timers(self) -> List[Timer]:
         """Get all active (not completed) timers"""
@@ -74,29 +370,159 @@ class TimerManager:
 
     def has_active_timers(self) -> bool:
         """Check if there are any active timers"""
-        return len(self.get_active_timers()) > 0
+        return any(not t.is_complete for t in self.timers.values())
 
     async def _run_timer(self, timer: Timer) -> None:
         """Run a single timer coroutine"""
-        while timer.remaining_seconds > 0 and not timer.paused:
-            await asyncio.sleep(1)
-            timer.tick()
-
-            if self._on_tick:
-                self._on_tick()
+        while not timer.is_complete and not timer.paused:
+            # Sleep until the displayed second changes, not a fixed 1s, so
+            # late wakeups never accumulate into drift
+            remaining = timer.remaining_time
+            delay = remaining - (math.ceil(remaining) - 1)
+            wake_at = time.monotonic() + delay
+            await asyncio.sleep(delay)
+            if self.diagnostics is not None:
+                self.diagnostics.record("timer.wake_lateness", time.monotonic() - wake_at)
+            self._tick(timer)
 
         # Timer completed
-        if timer.is_complete and self._on_complete:
-            self._on_complete(timer)
+        if timer.is_complete:
+            self._finish(timer)
+
+    def _tick(self, timer: Timer) -> None:
+        """Note a changed timer and schedule one batched on_tick call"""
+        if self._on_tick is None:
+            return
+        self._ticked[timer.id] = timer
+        self._request_tick()
+
+    def _request_tick(self) -> None:
+        """Schedule one batched on_tick call, honouring tick_rate"""
+        if self._tick_handle is not None:
+            return
+        loop = asyncio.get_running_loop()
+        delay = 0.0
+        if self.tick_rate:
+            delay = max(0.0, self._last_tick + 1 / self.tick_rate - loop.time())
+        # Even without a rate limit, ticks from the same loop iteration are
+        # delivered together
+        self._tick_handle = loop.call_later(delay, self._flush_ticks)
+
+    def _flush_ticks(self) -> None:
+        """Deliver the timers that ticked since the last call"""
+        self._tick_handle = None
+        self._last_tick = asyncio.get_running_loop().time()
+        ticked = list(self._ticked.values())
+        self._ticked.clear()
+        display_due, self._display_due = self._display_due, False
+        if (ticked or display_due) and self._on_tick:
+            if self.diagnostics is None:
+                self._on_tick(ticked)
+            else:
+                with self.diagnostics.timed("callback.on_tick"):
+                    self._on_tick(ticked)
+
+    def _finish(self, timer: Timer) -> None:
+        """Handle a timer reaching zero"""
+        self._forget(timer.id)
+        if self._on_complete:
+            if self.diagnostics is None:
+                self._on_complete(timer)
+            else:
+                with self.diagnostics.timed("callback.on_complete"):
+                    self._on_complete(timer)
+
+    async def _run_scheduler(self) -> None:
+        """Sleep until the earliest deadline and complete due timers"""
+        while len(self._schedule):
+            self._wakeup.clear()
+            delay = self._schedule.peek() - time.monotonic()
+            if delay > 0:
+                # Woken early when a timer with an earlier deadline is added
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = time.monotonic()
+            due = self._schedule.pop_due(now)
+            self._rebalance_schedule()
+            for timer_id in due:
+                timer = self.timers.get(timer_id)
+                if timer is None:
+                    continue
+
+                if self.diagnostics is not None:
+                    self.diagnostics.record("timer.wake_lateness", max(0.0, now - timer.deadline))
+
+                self._tick(timer)
+                self._finish(timer)
+
+    def _schedule_timer(self, timer: Timer) -> bool:
+        """Add a timer to the deadline heap and wake the scheduler"""
+        if timer.id in self._schedule or timer.paused:
+            return False
+
+        earliest = self._schedule.peek()
+        deadline = timer.deadline
+        self._schedule.push(timer.id, deadline)
+        self._rebalance_schedule()
+
+        if self._scheduler_task is None or self._scheduler_task.done():
+            self._wakeup = asyncio.Event()
+            self._scheduler_task = asyncio.create_task(self._run_scheduler())
+        elif earliest is None or deadline < earliest:
+            self._wakeup.set()
+        if self._on_tick is not None and self._display_handle is None:
+            # Flip the display when this timer's shown second changes
+            loop = asyncio.get_running_loop()
+            self._display_at = loop.time() + ((deadline - time.monotonic()) % 1.0 or 1.0)
+            self._display_handle = loop.call_at(self._display_at, self._display_tick)
+        return True
+
+    def _display_tick(self) -> None:
+        """Request one coalesced on_tick, then re-arm while timers remain"""
+        self._display_handle = None
+        if not len(self._schedule) or self._on_tick is None:
+            return
+        self._display_due = True
+        self._request_tick()
+        # Keep the phase: step whole seconds past now after a late wakeup
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        self._display_at += max(1.0, math.ceil(now - self._display_at))
+        self._display_handle = loop.call_at(self._display_at, self._display_tick)
+
+    def _rebalance_schedule(self) -> None:
+        """Switch between heap and timing wheel around wheel_threshold"""
+        if self.wheel_threshold is None:
+            return
+        size = len(self._schedule)
+        if isinstance(self._schedule, _DeadlineHeap) and size > self.wheel_threshold:
+            schedule: Any = _TimingWheel()
+        elif isinstance(self._schedule, _TimingWheel) and size < self.wheel_threshold // 2:
+            schedule = _DeadlineHeap()
+        else:
+            return
+        for timer_id, deadline in self._schedule.items():
+            schedule.push(timer_id, deadline)
+        self._schedule = schedule
 
     def start_timer(self, timer_id: str) -> bool:
         """Start a specific timer"""
         timer = self.get_timer(timer_id)
         if timer is None:
             return False
+        if not timer.started:
+            timer.start()
+            self._checkpoint(timer)
+
+        if self.engine == "scheduler":
+            return self._schedule_timer(timer)
 
         # Don't start if already running
-        if timer_id in self.tasks and not self.tasks[timer_id].done():
+        if timer.id in self.tasks and not self.tasks[timer.id].done():
             return False
 
         task = asyncio.create_task(self._run_timer(timer))
@@ -107,7 +533,9 @@ class TimerManager:
         """Pause a timer"""
         timer = self.get_timer(timer_id)
         if timer:
-            timer.paused = True
+            timer.pause()
+            self._schedule.discard(timer.id)
+            self._checkpoint(timer)
             return True
         return False
 
@@ -115,7 +543,8 @@ class TimerManager:
         """Resume a paused timer"""
         timer = self.get_timer(timer_id)
         if timer and timer.paused:
-            timer.paused = False
+            timer.resume()
+            self._checkpoint(timer)
             # Restart the timer task
             self.start_timer(timer.id)
             return True
@@ -124,14 +553,17 @@ class TimerManager:
     async def start_all(self) -> None:
         """Start all timers"""
         self._running = True
-        for timer_id in self.timers:
+        for timer_id in list(self.timers):
             if timer_id not in self.tasks or self.tasks[timer_id].done():
                 self.start_timer(timer_id)
 
     async def wait_all(self) -> None:
         """Wait for all timers to complete"""
-        if self.tasks:
-            await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+        tasks = list(self.tasks.values())
+        if self._scheduler_task is not None:
+            tasks.append(self._scheduler_task)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     def stop_all(self) -> None:
         """Stop all timers"""
@@ -140,11 +572,28 @@ class TimerManager:
             task.cancel()
         self.tasks.clear()
 
+        self._schedule.clear()
+        if self._scheduler_task is not None:
+            self._scheduler_task.cancel()
+            self._scheduler_task = None
+        if self._display_handle is not None:
+            self._display_handle.cancel()
+            self._display_handle = None
+
+        if self._tick_handle is not None:
+            self._tick_handle.cancel()
+            self._tick_handle = None
+        self._ticked.clear()
+        self._display_due = False
+
     def cleanup_completed(self) -> int:
         """Remove completed timers, return count removed"""
         completed_ids = [tid for tid, t in self.timers.items() if t.is_complete]
         for tid in completed_ids:
             if tid in self.tasks:
                 del self.tasks[tid]
+            self._schedule.discard(tid)
             del self.timers[tid]
+            self._index.discard(tid)
+            self._forget(tid)
         return len(completed_ids)
@@ -2,83 +2,377 @@
 Todo module - Todo item management
 """
 
-from typing import List, Optional
-from storage import Todo, Storage
+import atexit
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from storage import Todo, Storage, new_id
+from index import PrefixIndex, pick_match
 
 
 class TodoManager:
-    """Manages todo items with persistence"""
+    """Manages todo items with persistence
 
-    def __init__(self, storage: Optional[Storage] = None):
+    With a storage backend that supports queries (SQLite) todos are not
+    kept in memory; filtering, counting and ID lookups go to the backend.
+    Mutations hold a lock so a worker thread can complete todos safely.
+    In memory, pending todos and the completed count are kept up to date
+    on every change, so counts and the pending list never rescan todos.
+
+    Other processes may share the storage: changes are made under the
+    storage lock after reloading, and reads reload only when the files
+    changed since this manager last read or wrote them.
+
+    With a flush_interval, changes are written behind: they are buffered
+    and persisted together at most flush_interval seconds later, or on
+    flush(). Inside batch() changes are always written once at the end.
+    In query mode, ID lookups see buffered changes without writing them;
+    listing and counting flush first, except inside batch().
+    """
+
+    def __init__(self, storage: Optional[Storage] = None, flush_interval: Optional[float] = None):
         self.storage = storage or Storage()
         self.todos: List[Todo] = []
+        self._by_id: Dict[str, Todo] = {}
+        self._index = PrefixIndex()
+        # Pending todos in list order, keyed by object so duplicate IDs
+        # from a hand-edited file are still counted
+        self._pending: Dict[int, Todo] = {}
+        self._completed_count = 0
+        self._pending_view: Optional[Tuple[int, List[Todo]]] = None
+        self._queryable = self.storage.supports_queries
+        self.version = 0  # Bumped on every change, for display caching
+        self._lock = threading.RLock()
+        self.flush_interval = flush_interval or None
+        self._pending_ops: List[Tuple[str, List[Todo]]] = []
+        # Latest buffered state per ID (None once deleted), so lookups in
+        # query mode see buffered changes without flushing them
+        self._buffered: Dict[str, Optional[Todo]] = {}
+        self._batch_depth = 0
+        self._flush_timer: Optional[threading.Timer] = None
+        if self.flush_interval:
+            atexit.register(self.close)
         self.load()
 
     def load(self) -> None:
-        """Load todos from storage"""
-        self.todos = self.storage.load_todos()
+        """Load todos from storage, keeping changes not yet flushed"""
+        with self._lock, self.storage.lock():
+            if self._queryable:
+                self.version += 1
+                return
+            todos = self._reapply_pending(self.storage.load_todos())
+            by_id: Dict[str, Todo] = {}
+            pending: Dict[int, Todo] = {}
+            for todo in todos:
+                by_id.setdefault(todo.id, todo)
+                if not todo.completed:
+                    pending[id(todo)] = todo
+            # Swap complete structures in: list_pending reads without the lock
+            self.todos = todos
+            self._by_id = by_id
+            self._pending = pending
+            self._completed_count = len(todos) - len(pending)
+            self._index = PrefixIndex(by_id)
+            self.version += 1
+
+    def _reapply_pending(self, todos: List[Todo]) -> List[Todo]:
+        """Apply buffered changes on top of freshly loaded todos
+
+        Buffered updates to todos that are gone from storage (deleted by
+        another process) are dropped rather than bringing them back.
+        """
+        if not self._pending_ops:
+            return todos
+        by_id: Dict[str, Todo] = {}
+        for todo in todos:
+            by_id.setdefault(todo.id, todo)
+        kept: List[Tuple[str, List[Todo]]] = []
+        for op, changed in self._pending_ops:
+            if op == "update":
+                gone = [todo for todo in changed if todo.id not in by_id]
+                for todo in gone:
+                    self._buffered[todo.id] = None
+                changed = [todo for todo in changed if todo.id in by_id]
+                if not changed:
+                    continue
+            for todo in changed:
+                if op == "delete":
+                    by_id.pop(todo.id, None)
+                else:
+                    by_id[todo.id] = todo
+            kept.append((op, changed))
+        self._pending_ops = kept
+        return list(by_id.values())
+
+    def refresh(self) -> bool:
+        """Reload todos if another process changed the storage
+
+        Returns True if todos were reloaded.
+        """
+        if self._queryable or not self.storage.is_stale():
+            return False
+        # Another thread changing todos reloads before it does, and may be
+        # in the middle of a slow write: readers keep what they have
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            with self.storage.lock():
+                if not self.storage.is_stale():
+                    return False
+                self.load()
+        finally:
+            self._lock.release()
+        return True
+
+    @contextmanager
+    def _mutating(self) -> Iterator[None]:
+        """Lock out other threads and processes and start from fresh todos"""
+        with self._lock, self.storage.lock():
+            self.refresh()
+            yield
 
     def save(self) -> None:
         """Save todos to storage"""
-        self.storage.save_todos(self.todos)
+        if self._queryable:
+            return
+        with self._lock, self.storage.lock():
+            self.storage.save_todos(self.todos)
+
+    def _commit(self, op: str, changed: List[Todo]) -> None:
+        """Persist a mutation through the storage backend, or buffer it"""
+        self.version += 1
+        if self._batch_depth == 0 and not self.flush_interval:
+            self.storage.save_changes(op, changed, self.todos)
+            return
+        self._pending_ops.append((op, list(changed)))
+        for todo in changed:
+            self._buffered[todo.id] = None if op == "delete" else todo
+        if self._batch_depth == 0 and self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self) -> None:
+        """Write all buffered changes to storage"""
+        with self._lock, self.storage.lock():
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending_ops:
+                return
+            self.refresh()
+            ops, self._pending_ops = self._pending_ops, []
+            self._buffered = {}
+            self.storage.save_batch(ops, self.todos)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group the changes made inside the block into one storage write"""
+        with self._mutating():
+            self._batch_depth += 1
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.flush()
+
+    def close(self) -> None:
+        """Flush pending changes and wait for background storage work"""
+        self.flush()
+        if self.flush_interval:
+            atexit.unregister(self.close)
+        wait_compaction = getattr(self.storage, "wait_compaction", None)
+        if wait_compaction is not None:
+            wait_compaction()
+
+    def _track(self, todo: Todo) -> None:
+        """Count a todo that joined the in-memory list"""
+        if todo.completed:
+            self._completed_count += 1
+        else:
+            self._pending[id(todo)] = todo
+
+    def _untrack(self, todo: Todo) -> None:
+        """Uncount a todo that left the in-memory list"""
+        if todo.completed:
+            self._completed_count -= 1
+        else:
+            del self._pending[id(todo)]
+
+    def _mark_complete(self, todo: Todo) -> None:
+        """Complete a todo and move it between the counters"""
+        was_pending = not todo.completed
+        todo.mark_complete()
+        if was_pending and not self._queryable:
+            del self._pending[id(todo)]
+            self._completed_count += 1
+
+    def _exists(self, todo_id: str) -> bool:
+        """Check if a todo with this exact ID exists"""
+        if self._queryable:
+            if todo_id in self._buffered:
+                return self._buffered[todo_id] is not None
+            return self.storage.get_todo(todo_id) is not None
+        return todo_id in self._by_id
 
     def add(self, title: str, timer_minutes: Optional[int] = None) -> Todo:
         """Add a new todo item"""
         todo = Todo.create(title=title, timer_minutes=timer_minutes)
-        self.todos.append(todo)
-        self.save()
+        with self._mutating():
+            while self._exists(todo.id):
+                todo.id = new_id()
+            if not self._queryable:
+                self.todos.append(todo)
+                self._by_id[todo.id] = todo
+                self._index.add(todo.id)
+                self._track(todo)
+            self._commit("add", [todo])
         return todo
 
     def complete(self, todo_id: str) -> Optional[Todo]:
-        """Mark a todo as completed by ID"""
-        for todo in self.todos:
-            if todo.id == todo_id or todo.id.startswith(todo_id):
-                todo.mark_complete()
-                self.save()
-                return todo
-        return None
+        """Mark a todo as completed by ID or unique prefix"""
+        with self._mutating():
+            todo = self.get(todo_id)
+            if todo is None:
+                return None
+            self._mark_complete(todo)
+            self._commit("update", [todo])
+        return todo
+
+    def complete_many(self, todo_ids: Iterable[str]) -> List[Todo]:
+        """Mark several pending todos complete with a single storage write
+
+        Returns the todos that were actually completed.
+        """
+        with self._mutating():
+            completed = []
+            for todo_id in todo_ids:
+                todo = self.get(todo_id)
+                if todo is not None and not todo.completed:
+                    self._mark_complete(todo)
+                    completed.append(todo)
+            if completed:
+                self._commit("update", completed)
+        return completed
 
     def delete(self, todo_id: str) -> bool:
-        """Delete a todo by ID"""
-        for i, todo in enumerate(self.todos):
-            if todo.id == todo_id or todo.id.startswith(todo_id):
-                self.todos.pop(i)
-                self.save()
-                return True
-        return False
+        """Delete a todo by ID or unique prefix"""
+        with self._mutating():
+            todo = self.get(todo_id)
+            if todo is None:
+                return False
+            if not self._queryable:
+                for i, item in enumerate(self.todos):
+                    if item is todo:
+                        self.todos.pop(i)
+                        break
+                del self._by_id[todo.id]
+                self._index.discard(todo.id)
+                self._untrack(todo)
+            self._commit("delete", [todo])
+        return True
 
     def get(self, todo_id: str) -> Optional[Todo]:
-        """Get a todo by ID"""
-        for todo in self.todos:
-            if todo.id == todo_id or todo.id.startswith(todo_id):
-                return todo
-        return None
+        """Get a todo by ID or unique prefix
+
+        Raises AmbiguousIDError if the prefix matches several todos.
+        """
+        if self._queryable:
+            return self._query_get(todo_id)
+
+        self.refresh()
+        target_id = self._index.resolve(todo_id)
+        if target_id is None:
+            return None
+        return self._by_id[target_id]
+
+    def _query_get(self, todo_id: str) -> Optional[Todo]:
+        """Look up a todo in the backend, seeing buffered changes first"""
+        if todo_id in self._buffered:
+            return self._buffered[todo_id]
+        target_id = self.storage.resolve_id(todo_id)
+        if not self._buffered:
+            return self.storage.get_todo(target_id) if target_id else None
+        matches = {
+            buffered_id for buffered_id, todo in self._buffered.items()
+            if todo is not None and buffered_id.startswith(todo_id)
+        }
+        if target_id is not None and target_id not in self._buffered:
+            matches.add(target_id)
+        target_id = pick_match(todo_id, sorted(matches))
+        if target_id is None:
+            return None
+        return self._buffered.get(target_id) or self.storage.get_todo(target_id)
+
+    def _flush_for_read(self) -> None:
+        """Write buffered changes before a query, unless inside batch()"""
+        if self._batch_depth == 0:
+            self.flush()
 
     def list_all(self) -> List[Todo]:
         """Get all todos"""
+        if self._queryable:
+            self._flush_for_read()
+            return self.storage.query_todos()
+        self.refresh()
         return self.todos
 
     def list_pending(self) -> List[Todo]:
-        """Get all pending (not completed) todos"""
-        return [todo for todo in self.todos if not todo.completed]
+        """Get all pending (not completed) todos
+
+        In memory the same list is returned until the next change, so
+        callers must not modify it. This never waits for the mutation lock,
+        so the dashboard keeps drawing while a worker thread writes.
+        """
+        if self._queryable:
+            self._flush_for_read()
+            return self.storage.query_todos(completed=False)
+        self.refresh()
+        view = self._pending_view
+        if view is None or view[0] != self.version:
+            # Read the version first: a change racing with the copy bumps
+            # it again afterwards, so the view is rebuilt next time. Copying
+            # a dict runs without releasing the GIL, so it sees a whole state.
+            version = self.version
+            view = self._pending_view = (version, list(self._pending.values()))
+        return view[1]
 
     def list_completed(self) -> List[Todo]:
         """Get all completed todos"""
+        if self._queryable:
+            self._flush_for_read()
+            return self.storage.query_todos(completed=True)
+        self.refresh()
         return [todo for todo in self.todos if todo.completed]
 
     def clear_completed(self) -> int:
         """Remove all completed todos, return count removed"""
-        original_count = len(self.todos)
-        self.todos = [todo for todo in self.todos if not todo.completed]
-        self.save()
-        return original_count - len(self.todos)
+        with self._mutating():
+            if self._queryable:
+                self.flush()
+                self.version += 1
+                return self.storage.delete_completed()
+
+            removed = [todo for todo in self.todos if todo.completed]
+            for todo in removed:
+                if self._by_id.get(todo.id) is todo:
+                    del self._by_id[todo.id]
+                    self._index.discard(todo.id)
+            self.todos = [todo for todo in self.todos if not todo.completed]
+            self._completed_count = 0
+            self._commit("delete", removed)
+        return len(removed)
 
     def count(self) -> dict:
         """Get todo counts"""
-        pending = len(self.list_pending())
-        completed = len(self.list_completed())
+        if self._queryable:
+            self._flush_for_read()
+            return self.storage.count_todos()
+
+        self.refresh()
         return {
             "total": len(self.todos),
-            "pending": pending,
-            "completed": completed,
+            "pending": len(self._pending),
+            "completed": self._completed_count,
         }
@@ -11,22 +11,12 @@ if sys.platform == "win32":
     sys.stderr.reconfigure(encoding='utf-8')
     os.system("")  # Enable ANSI escape sequences
 
-from typing import List, Optional
+from typing import Dict, Hashable, List, Optional, Tuple
 from rich.console import Console, Group
 from rich.table import Table
 from rich.panel import Panel
-from rich.progress import (
-    Progress,
-    BarColumn,
-    TextColumn,
-    TimeRemainingColumn,
-    TaskProgressColumn,
-    SpinnerColumn,
-)
-from rich.layout import Layout
 from rich.align import Align
 from rich.text import Text
-from rich.live import Live
 
 from storage import Timer, Todo
 
@@ -51,6 +41,25 @@ class PomodoroUI:
 
     def __init__(self):
         self.console = Console(force_terminal=True)
+        # Render caches: rows keyed by the fields they show, whole todo
+        # tables by TodoManager.version, and the static help panel
+        self._timer_rows: Dict[str, Tuple[Hashable, Tuple[str, ...]]] = {}
+        self._todo_rows: Dict[str, Tuple[Hashable, Tuple[str, ...]]] = {}
+        self._todo_table: Optional[Tuple[Hashable, Table]] = None
+        self._help_panel: Optional[Panel] = None
+
+    @staticmethod
+    def display_key(
+        timers: List[Timer],
+        todo_version: Optional[int] = None,
+        todo_page: int = 0,
+    ) -> Hashable:
+        """Get a key that changes whenever the main display would change"""
+        return (
+            todo_version,
+            todo_page,
+            tuple((t.id, t.title, t.remaining_seconds, t.paused) for t in timers),
+        )
 
     def create_timer_table(self, timers: List[Timer]) -> Table:
         """Create a table displaying all active timers"""
@@ -74,35 +83,63 @@ class PomodoroUI:
             )
         else:
             for timer in timers:
-                # Create progress bar
-                progress_pct = timer.progress * 100
-                bar_width = 20
-                filled = int(bar_width * timer.progress)
-                empty = bar_width - filled
-                progress_bar = f"[red]{'=' * filled}[/red][dim]{'.' * empty}[/dim]"
-
-                # Status indicator
-                if timer.paused:
-                    status = "[yellow]PAUSED[/yellow]"
-                elif timer.remaining_seconds <= 10:
-                    status = f"{SYMBOLS['clock']} [blink]ENDING[/blink]"
-                elif timer.remaining_seconds <= 60:
-                    status = f"{SYMBOLS['fire']} FINAL"
-                else:
-                    status = "[green]RUNNING[/green]"
-
-                table.add_row(
-                    timer.id[:6],
-                    timer.title,
-                    progress_bar,
-                    timer.format_remaining(),
-                    status,
-                )
+                table.add_row(*self._timer_row(timer))
+            self._prune(self._timer_rows, timers)
 
         return table
 
-    def create_todo_table(self, todos: List[Todo], show_completed: bool = False) -> Table:
-        """Create a table displaying todos"""
+    def _timer_row(self, timer: Timer) -> Tuple[str, ...]:
+        """Get the table cells for a timer, reusing them if unchanged"""
+        remaining = timer.remaining_seconds
+        key = (timer.title, remaining, timer.paused)
+        cached = self._timer_rows.get(timer.id)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        # Create progress bar
+        bar_width = 20
+        filled = int(bar_width * timer.progress)
+        empty = bar_width - filled
+        progress_bar = f"[red]{'=' * filled}[/red][dim]{'.' * empty}[/dim]"
+
+        # Status indicator
+        if timer.paused:
+            status = "[yellow]PAUSED[/yellow]"
+        elif remaining <= 10:
+            status = f"{SYMBOLS['clock']} [blink]ENDING[/blink]"
+        elif remaining <= 60:
+            status = f"{SYMBOLS['fire']} FINAL"
+        else:
+            status = "[green]RUNNING[/green]"
+
+        row = (
+            timer.id[:6],
+            timer.title,
+            progress_bar,
+            timer.format_remaining(),
+            status,
+        )
+        self._timer_rows[timer.id] = (key, row)
+        return row
+
+    def create_todo_table(
+        self,
+        todos: List[Todo],
+        show_completed: bool = False,
+        version: Optional[int] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Table:
+        """Create a table displaying todos
+
+        Only the window of limit rows starting at offset is built, so cost
+        is bounded by the page size rather than the number of todos.
+        Passing the TodoManager version lets an unchanged table be reused.
+        """
+        cache_key = (version, show_completed, offset, limit)
+        if version is not None and self._todo_table is not None and self._todo_table[0] == cache_key:
+            return self._todo_table[1]
+
         title = "Pending Todos" if not show_completed else "All Todos"
         table = Table(
             title=title,
@@ -118,29 +155,73 @@ class PomodoroUI:
         table.add_column("Timer", justify="center", width=8)
 
         display_todos = todos if show_completed else [t for t in todos if not t.completed]
+        total = len(display_todos)
+
+        if limit is not None:
+            # Clamp to the last page rather than showing an empty one
+            if offset >= total > 0:
+                offset = (total - 1) // limit * limit
+            page = display_todos[offset:offset + limit]
+            if offset > 0 or total > len(page):
+                table.caption = f"Showing {offset + 1}-{offset + len(page)} of {total}"
+        else:
+            page = display_todos[offset:]
 
-        if not display_todos:
+        if not page:
             table.add_row(
                 "-", "-", "[dim]No todos[/dim]", "-"
             )
         else:
-            for todo in display_todos:
-                status = SYMBOLS["box_checked"] if todo.completed else SYMBOLS["box_empty"]
-                title_style = "[dim strike]" if todo.completed else ""
-                title_end = "[/dim strike]" if todo.completed else ""
-                timer_info = f"{todo.timer_minutes}m" if todo.timer_minutes else "-"
-
-                table.add_row(
-                    todo.id[:6],
-                    status,
-                    f"{title_style}{todo.title}{title_end}",
-                    timer_info,
-                )
+            for todo in page:
+                table.add_row(*self._todo_row(todo))
+            self._prune(self._todo_rows, page)
 
+        if version is not None:
+            self._todo_table = (cache_key, table)
         return table
 
+    @staticmethod
+    def _prune(cache: Dict[str, Tuple[Hashable, Tuple[str, ...]]], shown: list) -> None:
+        """Drop cached rows of items no longer shown once the cache bloats"""
+        if len(cache) > 2 * len(shown) + 64:
+            live_ids = {item.id for item in shown}
+            for item_id in [i for i in cache if i not in live_ids]:
+                del cache[item_id]
+
+    def _todo_row(self, todo: Todo) -> Tuple[str, ...]:
+        """Get the table cells for a todo, reusing them if unchanged"""
+        key = (todo.title, todo.completed, todo.timer_minutes)
+        cached = self._todo_rows.get(todo.id)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        status = SYMBOLS["box_checked"] if todo.completed else SYMBOLS["box_empty"]
+        title_style = "[dim strike]" if todo.completed else ""
+        title_end = "[/dim strike]" if todo.completed else ""
+        timer_info = f"{todo.timer_minutes}m" if todo.timer_minutes else "-"
+
+        row = (
+            todo.id[:6],
+            status,
+            f"{title_style}{todo.title}{title_end}",
+            timer_info,
+        )
+        self._todo_rows[todo.id] = (key, row)
+        return row
+
+    def page_size(self, reserved: int = 8) -> int:
+        """Get how many todo rows fit on screen besides reserved lines"""
+        return max(5, self.console.size.height - reserved)
+
+    def todo_page_size(self, timer_count: int) -> int:
+        """Get how many todo rows the main display shows under timer_count timers"""
+        return self.page_size(reserved=timer_count + 16)
+
     def create_help_panel(self) -> Panel:
         """Create a help panel showing available commands"""
+        if self._help_panel is not None:
+            return self._help_panel
+
         help_text = Text()
         help_text.append("Commands: ", style="bold cyan")
         help_text.append("add <min> [title] ", style="green")
@@ -157,20 +238,32 @@ class PomodoroUI:
         help_text.append("| ", style="dim")
         help_text.append("quit", style="red")
 
-        return Panel(
+        self._help_panel = Panel(
             Align.center(help_text),
             border_style="dim",
             padding=(0, 1),
         )
+        return self._help_panel
 
     def create_main_display(
         self,
         timers: List[Timer],
         todos: List[Todo],
+        todo_version: Optional[int] = None,
+        todo_page: int = 0,
     ) -> Group:
-        """Create the main display combining timers and todos"""
+        """Create the main display combining timers and todos
+
+        The todo table shows one page sized to fit under the timer table.
+        """
+        limit = self.todo_page_size(len(timers))
         timer_table = self.create_timer_table(timers)
-        todo_table = self.create_todo_table(todos)
+        todo_table = self.create_todo_table(
+            todos,
+            version=todo_version,
+            offset=todo_page * limit,
+            limit=limit,
+        )
         help_panel = self.create_help_panel()
 
         return Group(
@@ -181,6 +274,109 @@ class PomodoroUI:
             help_panel,
         )
 
+    def create_stats_display(self, summary: dict) -> Group:
+        """Create the focus statistics report from SessionHistory.summary()"""
+        days = summary["days"]
+        table = Table(
+            title=f"Focus - last {len(days)} days",
+            show_header=True,
+            header_style="bold cyan",
+            border_style="blue",
+            expand=True,
+        )
+        table.add_column("Day", style="dim")
+        table.add_column("Focus", justify="right")
+        table.add_column("Pomodoros", justify="right")
+        table.add_column("Completed", justify="right")
+
+        peak = max((totals.focus_minutes for _, totals in days), default=0) or 1
+        for day, totals in days:
+            bar = "#" * round(totals.focus_minutes * 10 / peak)
+            table.add_row(
+                day.strftime("%a %Y-%m-%d"),
+                f"{totals.focus_minutes} min [red]{bar}[/red]",
+                f"{totals.completed}/{totals.sessions}",
+                f"{totals.completion_rate:.0%}" if totals.sessions else "-",
+            )
+
+        period = summary["period"]
+        all_time = summary["all_time"]
+        table.caption = (
+            f"{period.focus_minutes} min over {period.completed} pomodoros "
+            f"({period.completion_rate:.0%} completed)"
+        )
+
+        totals_text = (
+            f"[cyan]All time:[/cyan] {all_time.focus_minutes // 60}h {all_time.focus_minutes % 60}m, "
+            f"{all_time.completed}/{all_time.sessions} pomodoros completed\n"
+            f"[cyan]Streak:[/cyan] {summary['current_streak']} day(s) "
+            f"[dim](longest {summary['longest_streak']})[/dim] {SYMBOLS['fire']}"
+        )
+        return Group(table, "", Panel(totals_text, border_style="dim", padding=(0, 1)))
+
+    def create_diag_table(self, diagnostics) -> Table:
+        """Create a table of the latency histograms in a Diagnostics"""
+        table = Table(
+            title=f"Diagnostics since {diagnostics.started_at}",
+            show_header=True,
+            header_style="bold cyan",
+            border_style="blue",
+            expand=True,
+        )
+        table.add_column("Metric", style="bold", no_wrap=True, min_width=20)
+        table.add_column("Count", justify="right")
+        for column in ("Mean", "p50", "p90", "p99", "Max"):
+            table.add_column(f"{column} ms", justify="right", no_wrap=True)
+
+        def ms(seconds: float) -> str:
+            return f"{seconds * 1000:.2f}"
+
+        if not diagnostics.histograms:
+            table.add_row("[dim]No samples yet[/dim]", "-", "-", "-", "-", "-", "-")
+        for name, histogram in sorted(diagnostics.histograms.items()):
+            table.add_row(
+                name,
+                str(histogram.count),
+                ms(histogram.mean),
+                ms(histogram.percentile(0.5)),
+                ms(histogram.percentile(0.9)),
+                ms(histogram.percentile(0.99)),
+                ms(histogram.max),
+            )
+        return table
+
+    def create_batch_summary(self, commands: int, seconds: float, histograms) -> Table:
+        """Create a throughput table for a finished batch run"""
+        rate = commands / seconds if seconds > 0 else 0.0
+        table = Table(
+            title=f"Ran {commands} command(s) in {seconds:.2f}s ({rate:,.1f}/s)",
+            show_header=True,
+            header_style="bold cyan",
+            border_style="blue",
+            expand=True,
+        )
+        table.add_column("Command", style="bold", no_wrap=True, min_width=12)
+        table.add_column("Count", justify="right")
+        for column in ("Total", "Mean", "p99", "Max"):
+            table.add_column(f"{column} ms", justify="right", no_wrap=True)
+
+        def ms(seconds: float) -> str:
+            return f"{seconds * 1000:.2f}"
+
+        if not histograms:
+            table.add_row("[dim]No commands[/dim]", "-", "-", "-", "-", "-")
+        # Slowest first: that is where the time went
+        for name, histogram in sorted(histograms.items(), key=lambda item: -item[1].total):
+            table.add_row(
+                name.split(".", 1)[-1],
+                str(histogram.count),
+                ms(histogram.total),
+                ms(histogram.mean),
+                ms(histogram.percentile(0.99)),
+                ms(histogram.max),
+            )
+        return table
+
     def print_welcome(self) -> None:
         """Print welcome message"""
         self.console.clear()